@@ -40,6 +40,11 @@ class MessageNodeConfig(Config):
     exchanges: list[Exchange] = []
     bindings: list[Binding] = []
     publishings: list[Publishing] = []
+    prefetch_count: int = 0  # Consumer channel QoS; 0 leaves the broker default (unbounded)
+    publisher_confirms: bool = True  # Await a broker ack for every publish on the producer channel
+    heartbeat: int = 30  # AMQP heartbeat timeout (s), so dead TCP connections are detected and reconnected
+    ack_batch_size: int = 1  # Deliveries covered by one multiple=True ack; 1 acks every message individually
+    ack_flush_interval: float = 0.05  # Seconds before a partially filled ack batch is flushed anyway
     observations_dir: str = "~/hamilton/observations"
 
 
@@ -48,6 +53,7 @@ class LogConfig(MessageNodeConfig):
     root_log_dir: str = "~/hamilton/log/"
     max_log_size: int = 10 * 1024 * 1024  # 10 MB
     backup_count: int = 3
+    flush_interval: float = 1.0  # Seconds log records may sit in the file buffers before being flushed to disk
 
 
 class DBConfig(MessageNodeConfig):
@@ -56,3 +62,10 @@ class DBConfig(MessageNodeConfig):
     mongo_uri: str = "mongodb://localhost:27017"
     mongo_db_name: str = "hamilton"
     mongo_collection_name: str = "satcom"
+    mongo_compressors: str = "zstd"  # Wire compression; needs pymongo's zstd extra, otherwise sent uncompressed
+    mongo_block_compressor: str = "zstd"  # WiredTiger on-disk compression for the collection
+    mongo_insert_batch_size: int = 2000  # Documents per insert_many when rebuilding the collection
+    mongo_insert_concurrency: int = 10  # Insert batches in flight at once (bounded well below the pool size)
+    mongo_max_pool_size: int = 20  # Connections per client; leaves headroom over the insert concurrency
+    mongo_write_concern: int = 1  # Primary acknowledgement only
+    mongo_journal: bool = False  # Don't wait for a journal sync on each write
@@ -1,4 +1,4 @@
-from typing import TypedDict, Union, Dict
+from typing import TypedDict, Union, Dict, Optional
 from datetime import datetime, UTC
 from enum import Enum
 
@@ -60,14 +60,21 @@ class MessageGenerator:
         }
         return message_schema
 
-    def generate_command(self, command_type: str, parameters: Dict[str, Union[str, int, float]] = {}) -> Message:
+    def generate_command(
+        self, command_type: str, parameters: Optional[Dict[str, Union[str, int, float]]] = None
+    ) -> Message:
+        parameters = parameters if parameters is not None else {}
         payload: CommandPayload = {"commandType": command_type, "parameters": parameters}
         return self.generate_message("command", payload)
 
-    def generate_telemetry(self, telemetry_type: str, parameters: Dict[str, Union[str, int, float]] = {}) -> Message:
+    def generate_telemetry(
+        self, telemetry_type: str, parameters: Optional[Dict[str, Union[str, int, float]]] = None
+    ) -> Message:
+        parameters = parameters if parameters is not None else {}
         payload: TelemetryPayload = {"telemetryType": telemetry_type, "parameters": parameters}
         return self.generate_message("telemetry", payload)
 
-    def generate_response(self, response_type: str, data: Dict[str, Union[str, int, float]] = {}) -> Message:
+    def generate_response(self, response_type: str, data: Optional[Dict[str, Union[str, int, float]]] = None) -> Message:
+        data = data if data is not None else {}
         payload: ResponsePayload = {"responseType": response_type, "data": data}
         return self.generate_message("response", payload)
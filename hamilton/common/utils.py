@@ -1,6 +1,7 @@
 import json
 import asyncio
 import numpy as np
+import orjson
 from datetime import datetime
 from bson import ObjectId
 import pytz
@@ -35,6 +36,52 @@ class CustomJSONDecoder(json.JSONDecoder):
                     pass
         return dct
 
+
+def decode_datetimes(obj):
+    """Apply CustomJSONDecoder's datetime conversion, in place, to an already parsed JSON object."""
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            if isinstance(value, str):
+                try:
+                    obj[key] = datetime.fromisoformat(value)
+                except ValueError:
+                    pass
+            elif isinstance(value, (dict, list)):
+                decode_datetimes(value)
+    elif isinstance(obj, list):
+        # As with object_hook, only strings held directly by dicts are converted
+        for value in obj:
+            if isinstance(value, (dict, list)):
+                decode_datetimes(value)
+    return obj
+
+
+def json_default(obj):
+    """orjson `default` hook covering the types CustomJSONEncoder handles (datetime is native to orjson)."""
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    elif isinstance(obj, np.generic):
+        return obj.item()
+    elif isinstance(obj, ObjectId):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def json_dumps(obj) -> bytes:
+    """Serialize to JSON bytes with orjson, accepting the same extra types as CustomJSONEncoder."""
+    # Contiguous NumPy arrays and scalars are encoded natively; anything else still falls back to json_default
+    return orjson.dumps(obj, default=json_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
+def json_loads(data: bytes | str):
+    """Equivalent of json.loads(data, cls=CustomJSONDecoder), parsed with orjson."""
+    try:
+        obj = orjson.loads(data)
+    except orjson.JSONDecodeError:
+        # Non-standard tokens (e.g. NaN from the stdlib encoder) are only accepted by json
+        return json.loads(data, cls=CustomJSONDecoder)
+    return decode_datetimes(obj)
+
 def utc_to_local(utc_dt):
     return utc_dt.replace(tzinfo=pytz.UTC).astimezone(pytz.timezone("HST"))
 
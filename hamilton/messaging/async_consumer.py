@@ -1,13 +1,13 @@
 import asyncio
 import aio_pika
-import json
 import logging
 import uuid
+from typing import Optional
 from aio_pika import IncomingMessage
 from hamilton.base.config import MessageNodeConfig
 from hamilton.messaging.rpc_manager import RPCManager
 from hamilton.messaging.interfaces import MessageHandler, MessageHandlerType
-from hamilton.common.utils import CustomJSONDecoder
+from hamilton.common.utils import json_loads
 
 
 logger = logging.getLogger(__name__)
@@ -18,19 +18,27 @@ class AsyncConsumer:
         self,
         config: MessageNodeConfig,
         rpc_manager: RPCManager,
-        handlers: list[MessageHandler] = [],
+        handlers: Optional[list[MessageHandler]] = None,
     ):
         self.config: MessageNodeConfig = config
         self.connection: aio_pika.Connection = None
         self.channel: aio_pika.Channel = None
         self.rpc_manager: RPCManager = rpc_manager
         self.queues: list[aio_pika.Queue] = []
-        self.handlers = handlers
+        self.handlers = handlers if handlers is not None else []
         self.handlers_map: dict[MessageHandlerType, list[MessageHandler]] = {}
+        # Coalesced acknowledgement state (only used when config.ack_batch_size > 1)
+        self._last_unacked: Optional[IncomingMessage] = None
+        self._unacked_count: int = 0
+        self._ack_flush_timer: Optional[asyncio.TimerHandle] = None
+        self._ack_flush_task: Optional[asyncio.Task] = None
 
-    async def _connect(self):
-        self.connection = await aio_pika.connect_robust(self.config.rabbitmq_server)
+    async def _connect(self, connection: aio_pika.abc.AbstractRobustConnection):
+        # Connection is owned by the message node; the consumer only opens its own channel on it
+        self.connection = connection
         self.channel = await self.connection.channel()
+        if self.config.prefetch_count:
+            await self.channel.set_qos(prefetch_count=self.config.prefetch_count)
 
     async def _declare_exchanges(self):
         for exchange in self.config.exchanges:
@@ -47,7 +55,8 @@ class AsyncConsumer:
         for binding in self.config.bindings:
             id = str(uuid.uuid4())
             queue_name = f"{binding.exchange}_{self.config.name}_{id}"
-            queue = await self.channel.declare_queue(queue_name, auto_delete=True)
+            # Per-node queues are transient: exclusive to this connection, never durable, gone when it closes
+            queue = await self.channel.declare_queue(queue_name, exclusive=True, auto_delete=True)
             logger.info(f"Declared queue: {queue_name}")
             self.queues.append(queue)
             for routing_key in binding.routing_keys:
@@ -56,9 +65,9 @@ class AsyncConsumer:
                     f"Bound to queue: {queue_name} with exchange: {binding.exchange} and routing key: {routing_key}"
                 )
 
-    async def start_consuming(self):
+    async def start_consuming(self, connection: aio_pika.abc.AbstractRobustConnection):
         logger.info("Starting consuming...")
-        await self._connect()
+        await self._connect(connection)
         self._build_handlers_map()
         await self._declare_exchanges()
         await self._setup_bindings()
@@ -68,17 +77,59 @@ class AsyncConsumer:
             await queue.consume(self._on_message_received)
         logger.info("Consumer setup complete.")
 
+    async def _ack_coalesced(self, message: IncomingMessage):
+        """Acknowledge on receipt, folding consecutive deliveries into one multiple=True ack per batch."""
+        self._last_unacked = message
+        self._unacked_count += 1
+        if self._unacked_count >= self.config.ack_batch_size:
+            await self._flush_acks()
+        elif self._ack_flush_timer is None:
+            # Don't hold a partial batch unacked indefinitely (it counts against the prefetch window)
+            self._ack_flush_timer = asyncio.get_running_loop().call_later(
+                self.config.ack_flush_interval, self._schedule_ack_flush
+            )
+
+    def _schedule_ack_flush(self):
+        self._ack_flush_timer = None
+        self._ack_flush_task = asyncio.create_task(self._flush_acks())
+
+    async def _flush_acks(self):
+        if self._ack_flush_timer is not None:
+            self._ack_flush_timer.cancel()
+            self._ack_flush_timer = None
+        message, self._last_unacked, self._unacked_count = self._last_unacked, None, 0
+        if message is not None:
+            try:
+                # Delivery tags are per channel, so this also acks every earlier delivery still pending
+                await message.ack(multiple=True)
+            except Exception as e:
+                logger.warning(f"Failed to acknowledge message batch: {e}")
+
+    def _decode(self, message: IncomingMessage) -> tuple[dict, Optional[MessageHandlerType]]:
+        message_body = json_loads(message.body)
+        try:
+            message_type = MessageHandlerType(message_body.get("messageType"))
+        except ValueError:
+            logger.error(f"Invalid message type: {message_body.get('messageType')}")
+            message_type = None
+        return message_body, message_type
+
     async def _on_message_received(self, message: IncomingMessage):
-        # Performs message acknowledgement
-        async with message.process():
-            message_body = json.loads(message.body.decode(), cls=CustomJSONDecoder)
+        if self.config.ack_batch_size > 1:
             try:
-                message_type = MessageHandlerType(message_body.get("messageType"))
-            except ValueError:
-                logger.error(f"Invalid message type: {message_body.get('messageType')}")
-            handlers = self.handlers_map.get(message_type, [])
-            correlation_id = message.correlation_id
-            logger.debug(f"Consumer: Received message with correlation id: {correlation_id} and type: {message_type}")
+                message_body, message_type = self._decode(message)
+            except Exception:
+                # Reject an undecodable message, as message.process() does below, rather than ack it with the batch
+                await message.reject()
+                raise
+            await self._ack_coalesced(message)
+        else:
+            # Performs message acknowledgement
+            async with message.process():
+                message_body, message_type = self._decode(message)
+        handlers = self.handlers_map.get(message_type, [])
+        correlation_id = message.correlation_id
+        logger.debug("Consumer: Received message with correlation id: %s and type: %s", correlation_id, message_type)
         if handlers:
             for handler in handlers:
                 response = await handler.handle_message(message_body, correlation_id)
@@ -101,8 +152,7 @@ class AsyncConsumer:
 
     async def stop(self):
         logger.info("Stopping consumer...")
+        await self._flush_acks()
         if self.channel:
             await self.channel.close()
-        if self.connection:
-            await self.connection.close()
         logger.info("Consumer stopped successfully.")
@@ -12,6 +12,8 @@ import asyncio
 import logging
 from typing import Any, Callable, Optional
 
+import aio_pika
+
 from hamilton.base.config import MessageNodeConfig
 from hamilton.base.messages import Message, MessageGenerator
 from hamilton.messaging.async_consumer import AsyncConsumer
@@ -26,6 +28,7 @@ logger = logging.getLogger(__name__)
 class AsyncMessageNode(IMessageNodeOperations):
     def __init__(self, config: MessageNodeConfig, handlers: list[MessageHandler], shutdown_event: asyncio.Event):
         self.config: MessageNodeConfig = config
+        self.connection: aio_pika.abc.AbstractRobustConnection = None
         self.rpc_manager: RPCManager = RPCManager()
         self.consumer: AsyncConsumer = AsyncConsumer(config, self.rpc_manager, handlers)
         self.producer: AsyncProducer = AsyncProducer(config, self.rpc_manager, shutdown_event)
@@ -41,9 +44,11 @@ class AsyncMessageNode(IMessageNodeOperations):
             self.shutdown_hooks.extend(handler.shutdown_hooks)
 
     async def start(self):
-        """Starts the consumer and publisher asynchronously."""
-        await self.consumer.start_consuming()
-        await self.producer.start()
+        """Starts the consumer and publisher asynchronously, each on its own channel of a shared connection."""
+        self.connection = await aio_pika.connect_robust(self.config.rabbitmq_server, heartbeat=self.config.heartbeat)
+        await self.consumer.start_consuming(self.connection)
+        # The consumer has already declared the node's exchanges on this connection
+        await self.producer.start(self.connection, declare_exchanges=False)
         logger.info("Started the consumer and publisher asynchronously.")
         logger.info("Invoking startup hooks...")
         for hook in self.startup_hooks:
@@ -57,6 +62,8 @@ class AsyncMessageNode(IMessageNodeOperations):
             await hook()
         await self.consumer.stop()
         await self.producer.stop()
+        if self.connection:
+            await self.connection.close()
         logger.info("Stopped the consumer and publisher asynchronously.")
         logger.info(f"{self.config.name} shutdown complete.")
 
@@ -32,9 +32,12 @@ class AsyncMessageNodeOperator:
     """
 
     def __init__(
-        self, config: MessageNodeConfig, handlers: list[MessageHandler] = [], shutdown_event: asyncio.Event = None
+        self,
+        config: MessageNodeConfig,
+        handlers: Optional[list[MessageHandler]] = None,
+        shutdown_event: asyncio.Event = None,
     ):
-        self.node = AsyncMessageNode(config, handlers, shutdown_event)
+        self.node = AsyncMessageNode(config, handlers or [], shutdown_event)
         self.config = config
 
     async def start(self) -> None:
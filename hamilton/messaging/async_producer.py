@@ -1,13 +1,12 @@
 import asyncio
 import aio_pika
-import json
 import logging
 import uuid
 import asyncio
 from typing import Optional, Any
-from aio_pika import ExchangeType, Message as AioPikaMessage
+from aio_pika import DeliveryMode, ExchangeType, Message as AioPikaMessage
 from hamilton.base.config import MessageNodeConfig, Publishing
-from hamilton.common.utils import CustomJSONEncoder
+from hamilton.common.utils import json_dumps
 from hamilton.base.messages import Message
 from hamilton.messaging.rpc_manager import RPCManager
 
@@ -22,6 +21,9 @@ class AsyncProducer:
         self.channel: aio_pika.Channel = None
         self.rpc_manager: RPCManager = rpc_manager
         self.shutdown_event: asyncio.Event = shutdown_event
+        self._owns_connection: bool = False
+        # Exchanges declared on this channel, reused for every publish instead of re-declared per message
+        self.exchanges: dict[str, aio_pika.abc.AbstractExchange] = {}
 
     def _build_publish_hashmap(self) -> dict:
         """Builds a hashmap of routing keys to Publishing objects for quick lookup."""
@@ -32,17 +34,25 @@ class AsyncProducer:
         logger.debug("Publishing map built successfully.")
         return publish_hashmap
 
-    async def _connect(self):
-        """Establishes the RabbitMQ connection and channel and declares exchanges."""
-        self.connection = await aio_pika.connect_robust(self.config.rabbitmq_server)
-        self.channel = await self.connection.channel()
-        await self._declare_exchanges()
+    async def _connect(
+        self, connection: Optional[aio_pika.abc.AbstractRobustConnection] = None, declare_exchanges: bool = True
+    ):
+        """Opens a channel on the given (shared) connection, or on a private one, and declares exchanges."""
+        if connection is None:
+            connection = await aio_pika.connect_robust(self.config.rabbitmq_server, heartbeat=self.config.heartbeat)
+            self._owns_connection = True
+        self.connection = connection
+        self.channel = await self.connection.channel(publisher_confirms=self.config.publisher_confirms)
+        if declare_exchanges:
+            await self._declare_exchanges()
+        else:
+            await self._bind_exchanges()
 
     async def _declare_exchanges(self):
         """Declares necessary exchanges."""
         for exchange in self.config.exchanges:
             try:
-                await self.channel.declare_exchange(
+                self.exchanges[exchange.name] = await self.channel.declare_exchange(
                     exchange.name,
                     ExchangeType(exchange.type),
                     durable=exchange.durable,
@@ -52,6 +62,11 @@ class AsyncProducer:
             except Exception as e:
                 logger.error(f"Failed to declare exchange '{exchange.name}': {e}")
 
+    async def _bind_exchanges(self):
+        """Binds handles to exchanges already declared on the connection, without a broker round trip."""
+        for exchange in self.config.exchanges:
+            self.exchanges[exchange.name] = await self.channel.get_exchange(exchange.name, ensure=False)
+
     async def publish(self, routing_key: str, message: Message, corr_id: Optional[str] = None):
         """Publishes a message asynchronously."""
         if not self.connection or not self.channel:
@@ -63,15 +78,24 @@ class AsyncProducer:
             return
 
         exchange_name = publishing.exchange
-        body = json.dumps(message, cls=CustomJSONEncoder).encode("utf-8")
+        body = json_dumps(message)
 
         try:
-            exchange = await self.channel.get_exchange(exchange_name)
+            exchange = self.exchanges.get(exchange_name)
+            if exchange is None:
+                # get_exchange() verifies with a passive declare (a broker round trip), so only pay it once
+                exchange = self.exchanges[exchange_name] = await self.channel.get_exchange(exchange_name)
             await exchange.publish(
-                AioPikaMessage(body=body, content_type="application/json", correlation_id=corr_id),
+                # Commands and telemetry are live state, never replayed, so the broker needn't write them to disk
+                AioPikaMessage(
+                    body=body,
+                    content_type="application/json",
+                    correlation_id=corr_id,
+                    delivery_mode=DeliveryMode.NOT_PERSISTENT,
+                ),
                 routing_key=routing_key,
             )
-            logger.debug(f"Message published to exchange '{exchange}' with routing key '{routing_key}'.")
+            logger.debug("Message published to exchange '%s' with routing key '%s'.", exchange, routing_key)
         except Exception as e:
             logger.error(f"Failed to publish message to exchange '{exchange}' with routing key '{routing_key}': {e}")
 
@@ -83,7 +107,7 @@ class AsyncProducer:
         # Ensure the message generator is used to add necessary fields like correlation_id
         corr_id = str(uuid.uuid4())
         future = self.rpc_manager.create_future_for_rpc(corr_id)
-        logger.debug(f"Future created for RPC with correlation id: {corr_id}")
+        logger.debug("Future created for RPC with correlation id: %s", corr_id)
 
         # Publish the message as usual
         await self.publish(routing_key, message, corr_id)
@@ -96,9 +120,13 @@ class AsyncProducer:
                 shutdown_wait_task = asyncio.create_task(self.shutdown_event.wait())
 
                 # Now pass the task instead of the coroutine
-                done, pending = await asyncio.wait(
-                    [future, shutdown_wait_task], timeout=timeout, return_when=asyncio.FIRST_COMPLETED
-                )
+                try:
+                    done, pending = await asyncio.wait(
+                        [future, shutdown_wait_task], timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                    )
+                finally:
+                    # Don't leave the watcher pending (one per RPC) once the call resolves, times out, or is cancelled
+                    shutdown_wait_task.cancel()
 
                 if future in done:
                     response = future.result()
@@ -107,6 +135,9 @@ class AsyncProducer:
                 elif self.shutdown_event.is_set():
                     logger.info("Shutdown event detected. Cancelling RPC call.")
                     return None
+                else:
+                    logger.error(f"RPC call timed out after {timeout} seconds.")
+                    return None
             # Else wait for the response or timeout
             else:
                 response = await asyncio.wait_for(future, timeout)
@@ -119,16 +150,18 @@ class AsyncProducer:
             self.rpc_manager.cleanup(corr_id)
             logger.debug("RPC call cleanup completed.")
 
-    async def start(self):
+    async def start(
+        self, connection: Optional[aio_pika.abc.AbstractRobustConnection] = None, declare_exchanges: bool = True
+    ):
         logger.info("Starting the producer...")
         if not self.connection or not self.channel:
-            await self._connect()
+            await self._connect(connection, declare_exchanges)
 
     async def stop(self):
         """Closes the connection."""
         logger.info("Stopping the publisher...")
         if self.channel:
             await self.channel.close()
-        if self.connection:
+        if self.connection and self._owns_connection:
             await self.connection.close()
         logger.info("Publisher stopped successfully.")
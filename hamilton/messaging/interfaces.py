@@ -24,6 +24,9 @@ class IMessageNodeOperations(ABC):
 
 # TODO: Configure default message handler for RPC responses based on `serve_as_rpc` arg
 class MessageHandler(ABC):
+    # Subclasses that declare their own __slots__ get dict-free instances; the rest keep a __dict__ as before
+    __slots__ = ("message_type", "node_operations", "startup_hooks", "shutdown_hooks")
+
     def __init__(self, message_type: MessageHandlerType = MessageHandlerType.ALL, serve_as_rpc: bool = False):
         self.message_type: MessageHandlerType = message_type
         self.node_operations: IMessageNodeOperations = None
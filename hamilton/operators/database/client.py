@@ -45,6 +45,11 @@ class DBClient(AsyncMessageNodeOperator):
         parameters = {}
         return await self._publish_command(command, parameters)
 
+    async def update(self) -> dict:
+        command = "update"
+        parameters = {}
+        return await self._publish_command(command, parameters)
+
 
 shutdown_event = asyncio.Event()
 
@@ -65,15 +70,16 @@ async def main():
     try:
         await client.start()
 
-        response = await client.query_record(sat_id="33499")
-        print(f"Response: {response}")
-
-        response = await client.get_satellite_ids()
-        print(f"Response: {response}")
-
-        response = await client.get_active_downlink_satellite_ids()
-        print(f"Response: {response}")
-        print(f"Response Items: {len(response)}")
+        # Queries are independent and correlated by id, so issue them concurrently
+        record, satellite_ids, active_ids = await asyncio.gather(
+            client.query_record(sat_id="33499"),
+            client.get_satellite_ids(),
+            client.get_active_downlink_satellite_ids(),
+        )
+        print(f"Response: {record}")
+        print(f"Response: {satellite_ids}")
+        print(f"Response: {active_ids}")
+        print(f"Response Items: {len(active_ids)}")
 
     except Exception as e:
         print(f"An unexpected error occurred: {e}")
@@ -6,6 +6,9 @@ class DBUpdaterConfig(DBConfig):
     exchanges = [
         Exchange(name="database", type="topic", durable=True, auto_delete=False),
     ]
+    bindings = [
+        Binding(exchange="database", routing_keys=["observatory.database.command.update"]),
+    ]
     publishings = (
         Publishing(
             exchange="database",
@@ -28,8 +31,14 @@ class DBControllerConfig(DBConfig):
         Exchange(name="database", type="topic", durable=True, auto_delete=False),
     ]
     bindings = [
-        Binding(exchange="database", routing_keys=["observatory.database.command.*"]),
+        Binding(
+            exchange="database",
+            routing_keys=["observatory.database.command.*", "observatory.database.telemetry.update"],
+        ),
     ]
+    prefetch_count = 64  # Queries are answered from an in-memory snapshot, so keep a deep pipeline of requests
+    publisher_confirms = False  # Replies are transient; a lost one surfaces as an RPC timeout on the caller
+    ack_batch_size = 16  # Query bursts are acknowledged with one multi-ack per 16 deliveries
     publishings = (
         Publishing(
             exchange="database",
@@ -50,6 +59,7 @@ class DBClientConfig(DBConfig):
     bindings = [
         Binding(exchange="database", routing_keys=["observatory.database.telemetry.#"]),
     ]
+    prefetch_count = 32  # Allow many outstanding query_record replies in flight at once
     publishings = (
         Publishing(
             exchange="database",
@@ -58,6 +68,7 @@ class DBClientConfig(DBConfig):
                 "observatory.database.command.query_record",
                 "observatory.database.command.get_satellite_ids",
                 "observatory.database.command.get_active_downlink_satellite_ids",
+                "observatory.database.command.update",
             ],
         ),
     )
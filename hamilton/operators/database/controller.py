@@ -1,45 +1,107 @@
+from dataclasses import dataclass
 from typing import Optional
 import asyncio
+import logging
 import signal
 
+import orjson
+
 from hamilton.base.messages import Message, MessageHandlerType
 from hamilton.messaging.interfaces import MessageHandler
 from hamilton.messaging.async_message_node_operator import AsyncMessageNodeOperator
 from hamilton.operators.database.config import DBControllerConfig
-from motor.motor_asyncio import AsyncIOMotorClient
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
 from hamilton.operators.database.setup_db import setup_and_index_db
 
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class DBSnapshot:
+    """Immutable view of the collection; replaced wholesale on reload so readers never need a lock"""
+
+    records: dict[int, dict]
+    satellite_ids: list
+    active_ids: list
+    # Pre-serialized id lists, embedded verbatim in telemetry so each request skips re-encoding them
+    satellite_ids_payload: orjson.Fragment
+    active_ids_payload: orjson.Fragment
+
+
+def _has_active_downlink(doc: dict) -> bool:
+    """Read the precomputed flag, falling back to the JE9PEL links for documents written before it existed"""
+    flag = doc.get("has_active_downlink")
+    if flag is None:
+        je9pel = doc.get("je9pel")
+        flag = bool(je9pel) and any(link.get("active") for link in je9pel.get("downlink", []))
+    return flag
+
 
 class DBControllerCommandHandler(MessageHandler):
     def __init__(self, config: DBControllerConfig):
         super().__init__(message_type=MessageHandlerType.COMMAND)
         self.config = config
-        self.db_client = AsyncIOMotorClient(self.config.mongo_uri)
-        self.db = self.db_client[self.config.mongo_db_name]
+        # Created by the startup hook, so no client (and connection pool) is left orphaned by the constructor
+        self.db_client: AsyncIOMotorClient = None
+        self.db: AsyncIOMotorDatabase = None
         self.startup_hooks = [self._setup_and_index_db]
         self.shutdown_hooks = [self._stop_db_client]
         self.routing_key_base = "observatory.database.telemetry"
+        # In-memory snapshot of the collection, loaded on first query and dropped on database update
+        self._snapshot: Optional[DBSnapshot] = None
+        self._cache_generation: int = 0
+        self._load_lock = asyncio.Lock()
 
     async def _setup_and_index_db(self):
         self.db_client, self.db = await setup_and_index_db()
 
     async def _stop_db_client(self):
-        self.db_client.close()
+        if self.db_client is not None:
+            self.db_client.close()
+
+    def invalidate_cache(self) -> None:
+        self._cache_generation += 1
+        self._snapshot = None
+        logger.info("Database query cache invalidated.")
+
+    async def _get_data(self) -> DBSnapshot:
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot
+        # Only the reload path serialises; concurrent first queries wait for a single scan
+        async with self._load_lock:
+            if self._snapshot is not None:
+                return self._snapshot
+            generation = self._cache_generation
+            cursor = self.db[self.config.mongo_collection_name].find({})
+            records = {doc["norad_cat_id"]: doc async for doc in cursor}
+            # Derived id lists are computed once per load rather than once per query
+            satellite_ids = [str(sat_id) for sat_id in sorted(records)]
+            active_ids = [str(sat_id) for sat_id, doc in records.items() if _has_active_downlink(doc)]
+            # A snapshot read while an invalidation arrived may predate the update; serve it once but don't keep it
+            snapshot = DBSnapshot(
+                records,
+                satellite_ids,
+                active_ids,
+                orjson.Fragment(orjson.dumps(satellite_ids)),
+                orjson.Fragment(orjson.dumps(active_ids)),
+            )
+            if generation == self._cache_generation:
+                self._snapshot = snapshot
+            logger.info(f"Loaded {len(records)} records into the database query cache.")
+            return snapshot
 
     async def query_record(self, key) -> dict:
-        return await self.db[self.config.mongo_collection_name].find_one({"norad_cat_id": int(key)})
+        snapshot = await self._get_data()
+        return snapshot.records.get(int(key))
 
     async def get_satellite_ids(self) -> list:
-        ids = await self.db[self.config.mongo_collection_name].distinct("norad_cat_id")
-        return [str(id) for id in ids]
+        snapshot = await self._get_data()
+        return snapshot.satellite_ids
 
     async def get_active_downlink_satellite_ids(self) -> list:
-        cursor = self.db[self.config.mongo_collection_name].find(
-            {"je9pel.downlink.active": True},  # Query for active downlinks in JE9PEL data
-            {"norad_cat_id": 1, "_id": 0},  # Projection
-        )
-        ids = [str(doc["norad_cat_id"]) async for doc in cursor]
-        return ids
+        snapshot = await self._get_data()
+        return snapshot.active_ids
 
     async def handle_message(self, message: Message, correlation_id: Optional[str] = None) -> None:
         response = None
@@ -53,10 +115,10 @@ class DBControllerCommandHandler(MessageHandler):
             response = await self.query_record(sat_id)
         elif command == "get_satellite_ids":
             telemetry_type = "satellite_ids"
-            response = await self.get_satellite_ids()
+            response = (await self._get_data()).satellite_ids_payload
         elif command == "get_active_downlink_satellite_ids":
             telemetry_type = "satellite_ids"
-            response = await self.get_active_downlink_satellite_ids()
+            response = (await self._get_data()).active_ids_payload
 
         if telemetry_type:
             routing_key = f"{self.routing_key_base}.{telemetry_type}"
@@ -65,11 +127,25 @@ class DBControllerCommandHandler(MessageHandler):
             await self.node_operations.publish_message(routing_key, telemetry_msg, correlation_id)
 
 
+class DBUpdateTelemetryHandler(MessageHandler):
+    """Invalidates the query cache once the updater has finished writing a new database"""
+
+    def __init__(self, command_handler: DBControllerCommandHandler):
+        super().__init__(message_type=MessageHandlerType.TELEMETRY)
+        self.command_handler = command_handler
+
+    async def handle_message(self, message: Message, correlation_id: Optional[str] = None) -> None:
+        payload = message["payload"]
+        if payload["telemetryType"] == "update" and payload["parameters"].get("status") == "finished":
+            self.command_handler.invalidate_cache()
+
+
 class DBController(AsyncMessageNodeOperator):
     def __init__(self, config: DBControllerConfig = None, shutdown_event: asyncio.Event = None):
         if config is None:
             config = DBControllerConfig()
-        handlers = [DBControllerCommandHandler(config)]
+        command_handler = DBControllerCommandHandler(config)
+        handlers = [command_handler, DBUpdateTelemetryHandler(command_handler)]
         super().__init__(config, handlers, shutdown_event)
 
 
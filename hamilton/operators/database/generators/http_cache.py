@@ -0,0 +1,51 @@
+"""
+Conditional GET support for the generators' download cache. Each URL's ETag/Last-Modified validators are kept in
+`cache/.etags.json`, so an unchanged upstream dump is answered with a 304 and read back from the local cache.
+"""
+
+import logging
+import os
+import threading
+from pathlib import Path
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+
+class HTTPValidatorCache:
+    def __init__(self, cache_dir: str | Path):
+        self.path = Path(cache_dir) / ".etags.json"
+        # Downloads may run on several threads; serialise the read-modify-write of the validators file
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict:
+        try:
+            return orjson.loads(self.path.read_bytes())
+        except (FileNotFoundError, orjson.JSONDecodeError):
+            return {}
+
+    def headers(self, url: str, file_path: str | Path) -> dict:
+        """Conditional request headers for `url`, only sent while its cached copy still exists"""
+        if not Path(file_path).is_file():
+            return {}
+        with self._lock:
+            validators = self._load().get(url, {})
+        headers = {}
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+        return headers
+
+    def update(self, url: str, response) -> None:
+        """Record the validators of a successful response; call only once its body is safely on disk"""
+        with self._lock:
+            validators = self._load()
+            validators[url] = {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+            }
+            tmp_path = self.path.with_name(f"{self.path.name}.tmp")
+            tmp_path.write_bytes(orjson.dumps(validators))
+            os.replace(tmp_path, self.path)
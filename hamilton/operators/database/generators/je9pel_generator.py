@@ -2,16 +2,21 @@
 Parse JE9PEL's satellite frequency list for merging with our "SATCOM" database
 """
 
-import json
 import logging
+import os
 import re
+from itertools import chain
 from pathlib import Path
 
 import numpy as np
+import orjson
 import pandas as pd
+import pyarrow as pa
 import requests
+from pyarrow import csv as pa_csv
 
 from hamilton.operators.database.config import DBUpdaterConfig
+from hamilton.operators.database.generators.http_cache import HTTPValidatorCache
 
 # Debugging
 # pd.set_option("display.max_rows", 500)
@@ -19,6 +24,14 @@ from hamilton.operators.database.config import DBUpdaterConfig
 
 logger = logging.getLogger(__name__)
 
+# A single frequency token in MHz: a value or a low-high range, with a '*' before or after it marking the active
+# frequency, e.g. "145.9", "*145.9", "145.9 *", "145.800-145.900*"
+_FREQ_RE = re.compile(
+    r"\s*(?P<active>\*)?\s*(?P<low>\d+(?:\.\d+)?)(?:\s*-\s*(?P<high>\d+(?:\.\d+)?))?\s*(?P<active_end>\*)?\s*"
+)
+# Field order of the (low, high, active) frequency tuples carried through filtering
+_FREQ_FIELDS = ("low", "high", "active")
+
 
 class JE9PELGenerator:
     def __init__(self, config: DBUpdaterConfig):
@@ -27,26 +40,49 @@ class JE9PELGenerator:
         self.cache_dir = self.db_path.parent / "cache"
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.validators = HTTPValidatorCache(self.cache_dir)
 
     ## I/O and HTTP Requests ##
 
-    @staticmethod
-    def download_csv(url: str) -> dict:
-        response = requests.get(url)
-        return response.text
+    def download_csv(self, url: str, file_path: str | Path) -> None:
+        file_path = Path(file_path)
+        with requests.get(url, headers=self.validators.headers(url, file_path), stream=True) as response:
+            if response.status_code == 304:
+                logger.debug(f"{url} not modified; keeping {file_path.absolute()}")
+                return
+            response.raise_for_status()
+            # Stream the response straight to disk rather than holding (and re-encoding) the whole CSV in memory
+            logger.debug(f"Writing {file_path.absolute()}")
+            # Download beside the target and swap it in, so a failed download leaves the previous cache intact
+            tmp_path = file_path.with_name(f"{file_path.name}.tmp")
+            with tmp_path.open("wb") as file:
+                for chunk in response.iter_content(chunk_size=64 * 1024):
+                    file.write(chunk)
+            os.replace(tmp_path, file_path)
+            self.validators.update(url, response)
 
-    def write_csv_to_file(self, data: str | Path, file_path: str | Path) -> None:
-        logger.debug(f"Writing {Path(file_path).absolute()}")
-        with Path(file_path).open("w") as file:
-            file.write(data)
+    @staticmethod
+    def _skip_invalid_row(row) -> str:
+        logger.debug(f"Skipping malformed JE9PEL row {row.number}: {row.text}")
+        return "skip"
 
     @staticmethod
     def load_csv(file_path: str | Path) -> pd.DataFrame:
         # JE9PEL specific columns
         column_names = ["name", "norad_cat_id", "uplink", "downlink", "beacon", "mode", "callsign", "status"]
+        # Declare the column types up front so the (multi-threaded) pyarrow parser skips type inference
+        column_types = {name: pa.string() for name in column_names}
+        column_types["norad_cat_id"] = pa.int64()
         # Read the CSV file
-        df = pd.read_csv(file_path, sep=";", header=None, names=column_names)
-        return df
+        table = pa_csv.read_csv(
+            file_path,
+            read_options=pa_csv.ReadOptions(column_names=column_names),
+            parse_options=pa_csv.ParseOptions(delimiter=";", invalid_row_handler=JE9PELGenerator._skip_invalid_row),
+            convert_options=pa_csv.ConvertOptions(column_types=column_types, strings_can_be_null=True),
+        )
+        # Strings stay Arrow-backed so the .str operations in filter() run as Arrow compute kernels
+        types_mapper = {pa.string(): pd.StringDtype("pyarrow"), pa.int64(): pd.Int64Dtype()}.get
+        return table.to_pandas(types_mapper=types_mapper, self_destruct=True)
 
     @staticmethod
     def write_df_as_json(df: pd.DataFrame, file_path: str | Path):
@@ -54,22 +90,12 @@ class JE9PELGenerator:
         df.to_json(file_path, orient="records", lines=True)
 
     def write_json_to_file(self, data, file_path):
-        logger.debug(f"Writing {Path(file_path).absolute()}")
-        with Path(file_path).open("w") as file:
-            json.dump(data, file, indent=4)
-
-    def initialize_cache_directory(self, files_to_remove: list = []) -> None:
-        cache_dir = self.cache_dir
-        # Ensure the directory exists
-        cache_dir.mkdir(exist_ok=True)
-
-        # Remove specific files if they exist
-        for file_name in files_to_remove:
-            file_path = cache_dir / file_name
-            if file_path.is_file():
-                file_path.unlink()
-
-        return cache_dir
+        file_path = Path(file_path)
+        logger.debug(f"Writing {file_path.absolute()}")
+        # Compact output; norad_cat_id keys are ints, which orjson only accepts with OPT_NON_STR_KEYS
+        tmp_path = file_path.with_name(f"{file_path.name}.tmp")
+        tmp_path.write_bytes(orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS))
+        os.replace(tmp_path, file_path)
 
     ## Data Extraction ##
 
@@ -84,11 +110,8 @@ class JE9PELGenerator:
 
         else:
             logger.debug("Creating local cache.")
-            cache_dir = self.initialize_cache_directory(files_to_remove=[filename])
-
             logger.debug("Fetching JE9PEL satellite frequency data.")
-            csv_data = self.download_csv(je9pel_url)
-            self.write_csv_to_file(csv_data, cache_dir / filename)
+            self.download_csv(je9pel_url, cache_dir / filename)
 
         data = self.load_csv(cache_dir / filename)
 
@@ -97,11 +120,8 @@ class JE9PELGenerator:
     ## Filter ##
 
     @staticmethod
-    def parse_frequencies(freq_str):
-        # Check if the frequency string is empty, NaN, or doesn't contain numeric values
-        if not freq_str or pd.isna(freq_str) or not re.search(r"\d", freq_str):
-            return []
-
+    def parse_frequencies(freq_str: str) -> list[tuple]:
+        """Parse a frequency string (pre-checked to contain digits) into (low, high, active) tuples in Hz"""
         freqs = []
         # Split multiple frequencies separated by backslash
         for freq in freq_str.split("/"):
@@ -109,59 +129,52 @@ class JE9PELGenerator:
             if "GHz" in freq:
                 continue
 
-            # Check for special active frequency indicated by '*'
-            is_active = "*" in freq
-            freq = freq.replace("*", "").strip()
-
-            # Check for frequency range indicated by '-'
-            if "-" in freq:
-                low, high = freq.split("-")
-                freqs.append({"low": float(low.strip()) * 1e6, "high": float(high.strip()) * 1e6, "active": is_active})
-            else:
-                # Single frequency value
-                try:
-                    freqs.append({"low": float(freq) * 1e6, "high": np.nan, "active": is_active})
-                except ValueError:
-                    # Handle any unexpected non-numeric values
-                    continue
+            # Match the active marker, low, and optional high edge in one pass; skip anything unexpected
+            match = _FREQ_RE.fullmatch(freq)
+            if match is None:
+                continue
+
+            low, high, active, active_end = match.group("low", "high", "active", "active_end")
+            active = active is not None or active_end is not None
+            freqs.append((float(low) * 1e6, None if high is None else float(high) * 1e6, active))
 
         return freqs
 
     @staticmethod
-    def merge_freq_dicts(freq_list):
-        unique_freqs = []
-        seen = set()
-        for freq_dict in freq_list:
-            # Create a tuple representation of the dictionary to check for uniqueness
-            freq_tuple = tuple(freq_dict.items())
-            if freq_tuple not in seen:
-                seen.add(freq_tuple)
-                unique_freqs.append(freq_dict)
-        return unique_freqs
-
-    def is_within_band(self, freq_dict):
-        # Check if any frequency in the dictionary falls within the defined bands
-        for freq_info in freq_dict:
-            freq_low = freq_info["low"]
-            freq_high = freq_info.get("high", freq_low)  # Use low freq if high freq is not specified
-
-            if (
-                self.config.VHF_LOW <= freq_low <= self.config.VHF_HIGH
-                or self.config.VHF_LOW <= freq_high <= self.config.VHF_HIGH
-            ):
-                return True
-            if (
-                self.config.UHF_LOW <= freq_low <= self.config.UHF_HIGH
-                or self.config.UHF_LOW <= freq_high <= self.config.UHF_HIGH
-            ):
-                return True
-
-        return False
+    def merge_freqs(freq_list):
+        # Deduplicate frequency tuples, keeping the first occurrence (dicts preserve insertion order)
+        return list(dict.fromkeys(freq_list))
+
+    def in_band(self, freqs: np.ndarray) -> np.ndarray:
+        """Elementwise check for frequencies within the VHF or UHF bands (NaN is never in band)"""
+        return ((freqs >= self.config.VHF_LOW) & (freqs <= self.config.VHF_HIGH)) | (
+            (freqs >= self.config.UHF_LOW) & (freqs <= self.config.UHF_HIGH)
+        )
+
+    def parse_in_band_frequencies(self, freq_strs: pd.Series) -> pd.Series:
+        """Parse each frequency string, keeping only frequencies whose low or high edge falls within a band"""
+        # Only strings containing digits can yield frequencies, so skip parsing the rest
+        has_digit = freq_strs.str.contains(r"\d", na=False)
+        parsed = freq_strs[has_digit].astype(object).map(self.parse_frequencies)
+
+        # Flatten to one frequency tuple per row (indexed by originating row) and band-filter in one pass
+        flat = parsed.explode().dropna()
+        # (n, 2) array of [low, high] edges in Hz; a missing high edge becomes NaN and is never in band
+        edges = np.array([freq[:2] for freq in flat], dtype=float).reshape(-1, 2)
+        in_band = self.in_band(edges).any(axis=1)
+        kept = flat[in_band].groupby(level=0).agg(list)
+
+        return pd.Series([kept.get(idx, []) for idx in freq_strs.index], index=freq_strs.index, dtype=object)
+
+    @staticmethod
+    def to_list(series) -> list:
+        # Missing values become None so aggregated lists serialize as JSON nulls
+        return [None if pd.isna(value) else value for value in series]
 
     @staticmethod
     def unique_list_or_all(series):
         if len(series) > 1 and len(series.unique()) > 1:
-            return list(series)
+            return JE9PELGenerator.to_list(series)
         return series.iloc[0]
 
     def filter(self, df: pd.DataFrame):
@@ -178,18 +191,12 @@ class JE9PELGenerator:
         # Most weather sats are active, despite JE9PEL not indicating so in the csv
         df = df[df.status.isin(["active", "weather", "deep space"])]
 
-        # Parse the frequency string for downlinks and beacons
-        df["parsed_downlink"] = df["downlink"].apply(self.parse_frequencies)
-        df["parsed_beacon"] = df["beacon"].apply(self.parse_frequencies)
+        # Parse the frequency string for downlinks and beacons, keeping only in-band frequencies
+        df["parsed_downlink"] = self.parse_in_band_frequencies(df["downlink"])
+        df["parsed_beacon"] = self.parse_in_band_frequencies(df["beacon"])
 
         # Filter rows where either 'downlink' or 'beacon' has a frequency within the band
-        df["parsed_downlink"] = df["parsed_downlink"].apply(
-            lambda freq_list: [freq for freq in freq_list if self.is_within_band([freq])]
-        )
-        df["parsed_beacon"] = df["parsed_beacon"].apply(
-            lambda freq_list: [freq for freq in freq_list if self.is_within_band([freq])]
-        )
-        df = df[df.apply(lambda row: any(row["parsed_downlink"]) or any(row["parsed_beacon"]), axis=1)]
+        df = df[(df["parsed_downlink"].str.len() > 0) | (df["parsed_beacon"].str.len() > 0)]
 
         # Drop the original 'downlink' and 'beacon' columns
         df = df.drop(columns=["downlink", "beacon"])
@@ -202,13 +209,13 @@ class JE9PELGenerator:
             df.groupby("norad_cat_id")
             .agg(
                 {
-                    "name": lambda x: list(x) if len(x) > 1 else x.iloc[0],
+                    "name": lambda x: self.to_list(x) if len(x) > 1 else x.iloc[0],
                     "uplink": "first",
                     "mode": lambda x: self.unique_list_or_all(x),
                     "callsign": lambda x: self.unique_list_or_all(x),
                     "status": lambda x: self.unique_list_or_all(x),
-                    "downlink": lambda x: self.merge_freq_dicts(sum(x, [])),
-                    "beacon": lambda x: self.merge_freq_dicts(sum(x, [])),
+                    "downlink": lambda x: self.merge_freqs(chain.from_iterable(x)),
+                    "beacon": lambda x: self.merge_freqs(chain.from_iterable(x)),
                 }
             )
             .reset_index()
@@ -218,24 +225,17 @@ class JE9PELGenerator:
 
     ## Transform ##
 
-    def transform(self, df: pd.DataFrame) -> dict:
-        logger.debug("Formatting database to normalized dictionary form.")
-        data_json = df.to_json(orient="records")
-
-        data = json.loads(data_json)
-
-        return data
-
-    ## Format ##
+    @staticmethod
+    def freqs_to_dicts(freqs: list[tuple]) -> list[dict]:
+        return [dict(zip(_FREQ_FIELDS, freq)) for freq in freqs]
 
-    def format(self, data):
-        logger.debug("Reindexing data to use norad_id as primary key.")
-        je9pel_db = {}
-        for d in data:
-            key = d["norad_cat_id"]
-            inner_dict = d.copy()
-            je9pel_db[key] = inner_dict
-        return je9pel_db
+    def transform(self, df: pd.DataFrame) -> dict:
+        logger.debug("Formatting database to normalized dictionary form, keyed by norad_id.")
+        # Frequencies travel as tuples through filtering; only the output records carry dicts
+        df = df.assign(downlink=df["downlink"].map(self.freqs_to_dicts), beacon=df["beacon"].map(self.freqs_to_dicts))
+        # Build the records directly, mapping missing scalars to None, instead of round-tripping through JSON
+        records = df.astype(object).where(df.notna(), None).to_dict(orient="records")
+        return {record["norad_cat_id"]: record for record in records}
 
     ## Entrypoint ##
 
@@ -248,8 +248,6 @@ class JE9PELGenerator:
 
         data = self.transform(data)
 
-        data = self.format(data)
-
         path = self.cache_dir / "je9pel.json"
         self.write_json_to_file(data, path)
 
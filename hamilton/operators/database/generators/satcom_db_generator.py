@@ -7,12 +7,18 @@ Need method for handling satellites that no longer have TLE in "tle.json".
 Schema validation would improve.
 """
 
-import json
 import logging
+import mmap
+import os
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+import numpy as np
+import orjson
 import requests
 import pandas as pd
 from hamilton.operators.database.config import DBUpdaterConfig
+from hamilton.operators.database.generators.http_cache import HTTPValidatorCache
 from hamilton.operators.database.generators.je9pel_generator import JE9PELGenerator
 
 
@@ -30,36 +36,49 @@ class SatcomDBGenerator:
         self.cache_dir = self.db_path.parent / "cache"
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.validators = HTTPValidatorCache(self.cache_dir)
+        self._cached_db: dict = None
+        self._cached_db_mtime: int = None
 
     ## I/O and HTTP Requests ##
 
-    @staticmethod
-    def download_json_data(url: str) -> dict:
-        response = requests.get(url)
-        return json.loads(response.text)
+    def download_bytes(self, url: str, file_path: str | Path, session: requests.Session = None) -> bytes:
+        """Fetch `url` into the cache at `file_path`, reusing the cached copy if the server reports it unchanged"""
+        file_path = Path(file_path)
+        response = (session or requests).get(url, headers=self.validators.headers(url, file_path))
+        if response.status_code == 304:
+            logger.debug(f"{url} not modified; reading {file_path.absolute()}")
+            return file_path.read_bytes()
+        # Never cache an error page in place of the payload
+        response.raise_for_status()
+        # Cache the body verbatim before recording its validators, so they never describe a missing file
+        self.write_bytes_to_file(response.content, file_path)
+        self.validators.update(url, response)
+        return response.content
 
     @staticmethod
     def load_json(path):
-        with open(path) as f:
-            return json.load(f)
-
-    def write_json_to_file(self, data, file_path):
-        logger.debug(f"Writing {Path(file_path).absolute()}")
-        with Path(file_path).open("w") as file:
-            json.dump(data, file, indent=4)
-
-    def initialize_cache_directory(self, files_to_remove: list = []) -> None:
-        cache_dir = Path(self.cache_dir)
-        # Ensure the directory exists
-        cache_dir.mkdir(exist_ok=True)
-
-        # Remove specific files if they exist
-        for file_name in files_to_remove:
-            file_path = cache_dir / file_name
-            if file_path.is_file():
-                file_path.unlink()
-
-        return cache_dir
+        with open(path, "rb") as f:
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (ValueError, OSError):
+                # Empty files and filesystems without mmap support
+                return orjson.loads(f.read())
+            # Parse straight out of the page cache rather than copying the file into a bytes buffer first
+            with mm, memoryview(mm) as buffer:
+                return orjson.loads(buffer)
+
+    def write_bytes_to_file(self, data: bytes, file_path):
+        file_path = Path(file_path)
+        logger.debug(f"Writing {file_path.absolute()}")
+        # Write beside the target and swap it in, so readers never observe a partially written file
+        tmp_path = file_path.with_name(f"{file_path.name}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, file_path)
+
+    def write_json_to_file(self, data, file_path, pretty: bool = False):
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        self.write_bytes_to_file(orjson.dumps(data, option=option), file_path)
 
     ## Data Extraction ##
 
@@ -79,20 +98,23 @@ class SatcomDBGenerator:
 
         else:
             logger.debug("Creating local cache.")
-            files_to_remove = ["tle.json", "satellites.json", "transmitters.json"]
-            self.cache_dir = self.initialize_cache_directory(files_to_remove=files_to_remove)
-
-            logger.debug("Fetching TLE data.")
-            tle_data = self.download_json_data(self.tle_url)
-            self.write_json_to_file(tle_data, self.cache_dir / "tle.json")
-
-            logger.debug("Fetching satellite data.")
-            satellites_data = self.download_json_data(self.satellites_url)
-            self.write_json_to_file(satellites_data, self.cache_dir / "satellites.json")
-
-            logger.debug("Fetching transmitter data.")
-            transmitters_data = self.download_json_data(self.transmitters_url)
-            self.write_json_to_file(transmitters_data, self.cache_dir / "transmitters.json")
+            # Existing cache files are replaced atomically below, so they stay valid until the new data arrives
+            file_names = ["tle.json", "satellites.json", "transmitters.json"]
+
+            # The three downloads are independent, so issue them concurrently over one pooled session
+            logger.debug("Fetching TLE, satellite, and transmitter data.")
+            urls = [self.tle_url, self.satellites_url, self.transmitters_url]
+            with requests.Session() as session, ThreadPoolExecutor(max_workers=len(urls)) as executor:
+                payloads = list(
+                    executor.map(
+                        lambda url, file_name: self.download_bytes(url, self.cache_dir / file_name, session),
+                        urls,
+                        file_names,
+                    )
+                )
+
+            # Parse each body once, rather than re-serializing the parsed data
+            tle_data, satellites_data, transmitters_data = map(orjson.loads, payloads)
 
         return tle_data, satellites_data, transmitters_data
 
@@ -160,35 +182,37 @@ class SatcomDBGenerator:
         # First exlode the dataframe, which creates a row for each transmitter
         df_exploded = df.explode("transmitters")
 
-        # Create two new columns corresponding to downlink high and low
-        df_exploded["tx_dl_low"] = df_exploded["transmitters"].map(lambda x: x["downlink_high"])
-        df_exploded["tx_dl_high"] = df_exploded["transmitters"].map(lambda x: x["downlink_low"])
+        # Pull the transmitter fields into columns in a single pass over the exploded rows
+        tx = pd.json_normalize(df_exploded["transmitters"].tolist(), max_level=0)
 
         # Create two new columns associated with tx alive (true, false) and status (active, inactive)
-        df_exploded["tx_alive"] = df_exploded["transmitters"].map(lambda x: x["alive"])
-        df_exploded["tx_status"] = df_exploded["transmitters"].map(lambda x: x["status"])
-
-        # Filter out dead or inactive transmitters
-        df_exploded = df_exploded[(df_exploded["tx_alive"] == True) & (df_exploded["tx_status"] == "active")]
-
-        # Filter out null downlink low AND high freqs
-        df_exploded = df_exploded[df_exploded["tx_dl_low"].notnull() | df_exploded["tx_dl_high"].notnull()]
-
-        # Replace nans in transmitter downlink freq ranges with its associated high or low
-        df_exploded["tx_dl_low"] = df_exploded["tx_dl_low"].fillna(df_exploded["tx_dl_high"])
-        df_exploded["tx_dl_high"] = df_exploded["tx_dl_high"].fillna(df_exploded["tx_dl_low"])
-
-        # Filter transmitter frequences to specified VHF range
-        df_filtered = df_exploded[
-            ((df_exploded["tx_dl_low"] >= self.config.VHF_LOW) & (df_exploded["tx_dl_high"] <= self.config.VHF_HIGH))
-            | ((df_exploded["tx_dl_low"] >= self.config.UHF_LOW) & (df_exploded["tx_dl_high"] <= self.config.UHF_HIGH))
-        ]
+        df_exploded["tx_alive"] = tx["alive"].to_numpy()
+        df_exploded["tx_status"] = tx["status"].to_numpy()
+
+        # Downlink edges as float arrays (missing -> NaN). These are deliberately crossed
+        # (low <- downlink_high), which makes the band test below an overlap test.
+        dl_low = tx["downlink_high"].to_numpy(dtype=float, na_value=np.nan)
+        dl_high = tx["downlink_low"].to_numpy(dtype=float, na_value=np.nan)
+
+        # Replace a missing edge with its counterpart; rows missing both stay NaN and never pass the band test
+        dl_low, dl_high = np.where(np.isnan(dl_low), dl_high, dl_low), np.where(np.isnan(dl_high), dl_low, dl_high)
+
+        # Keep live, active transmitters whose downlink lies within the VHF or UHF band, as one fused mask
+        mask = (
+            (df_exploded["tx_alive"].to_numpy() == True)
+            & (df_exploded["tx_status"].to_numpy() == "active")
+            & (
+                ((dl_low >= self.config.VHF_LOW) & (dl_high <= self.config.VHF_HIGH))
+                | ((dl_low >= self.config.UHF_LOW) & (dl_high <= self.config.UHF_HIGH))
+            )
+        )
+        df_filtered = df_exploded[mask]
 
         # "Implode" the dataframe, s.t. each row now represents a satellite with many transmitters
         agg_cols = {
             col: "first"
             for col in df_filtered.columns
-            if col not in ["transmitters", "sat_id", "tx_dl_low", "tx_dl_high"]
+            if col not in ["transmitters", "sat_id"]
         }
         df_imploded = (
             df_filtered.groupby("sat_id").agg({**agg_cols, "transmitters": lambda x: x.tolist()}).reset_index()
@@ -201,6 +225,12 @@ class SatcomDBGenerator:
         df_tle = pd.DataFrame(tle_data)
         df_satellites = pd.DataFrame(satellite_data)
         df_transmitters = pd.DataFrame(transmitter_data)
+        # Missing transmitter fields become None up front, since they end up nested in the output records
+        df_transmitters = df_transmitters.astype(object).where(df_transmitters.notna(), None)
+
+        # Low-cardinality string columns are stored as categoricals, so the merges below carry codes, not strings
+        df_tle["tle_source"] = df_tle["tle_source"].astype("category")
+        df_satellites = df_satellites.astype({col: "category" for col in ("status", "operator", "countries")})
 
         # Merge TLE DataFrame with satellite DataFrame
         # This will only select satellites that have an associated TLE.
@@ -225,16 +255,15 @@ class SatcomDBGenerator:
         logger.debug("Filtering dead or re-entered satellites.")
         df = df[df["status"] == "alive"]
 
-        # Group tx dataframe rows by `sat_id` and convert each group to a list of dictionaries.
-        df_transmitters_2 = df_transmitters.groupby("sat_id").apply(
-            lambda x: x.drop("sat_id", axis=1).to_dict(orient="records")
-        )
+        # Group tx records by `sat_id` into lists of dictionaries (sans `sat_id`) in a single pass.
+        transmitters_by_sat = defaultdict(list)
+        for record in df_transmitters.to_dict(orient="records"):
+            transmitters_by_sat[record.pop("sat_id")].append(record)
 
-        # Reset the index of the tx dataframe to an integer index and name list of dictionaries
-        # column as `transmitters`.
-        # This prepares the tx dataframe for merging.
-        df_transmitters_2 = df_transmitters_2.reset_index()
-        df_transmitters_2 = df_transmitters_2.rename(columns={0: "transmitters"})
+        # Tabulate as `sat_id` -> `transmitters` list, ready for merging.
+        df_transmitters_2 = pd.DataFrame(
+            {"sat_id": list(transmitters_by_sat), "transmitters": list(transmitters_by_sat.values())}
+        )
 
         # Select `sat_id`s that exist in both (tle+sat) dataframe and tx dataframe.
         logger.debug("Merging TLE + Satellite dataframe with transmitter dataframe.")
@@ -244,13 +273,9 @@ class SatcomDBGenerator:
         logger.debug("Filtering database by frequency bands.")
         df_final = self.filter_by_transmitter_frequency(df_merged)
 
-        # Serialize dataframe to json; this will properly and, among other methods, most straightforwardly
-        # convert NaN's to nulls.
+        # Build the records directly, mapping missing scalars to None, instead of round-tripping through JSON
         logger.debug("Formatting database to normalized dictionary form.")
-        data_json = df_final.to_json(orient="records")
-
-        # To (lazily) fix the foward slashes added from DataFrame -> json, we load as dict and *then* write out.
-        data = json.loads(data_json)
+        data = df_final.astype(object).where(df_final.notna(), None).to_dict(orient="records")
 
         return data
 
@@ -259,13 +284,8 @@ class SatcomDBGenerator:
     def format(self, data) -> dict:
         """Re-index the dictionary by satnogs 'norad_cat_id' as the primary key"""
         logger.debug("Reindexing data to use norad_cat_id as primary key.")
-        satcom_db = {}
-        for d in data:
-            # key = d["sat_id"]
-            key = d["norad_cat_id"]
-            inner_dict = d.copy()
-            satcom_db[key] = inner_dict
-        return satcom_db
+        # The records are freshly built by `transform`, so they are keyed as-is rather than copied
+        return {d["norad_cat_id"]: d for d in data}
 
     ## Merge ##
     def merge_with_je9pel(self, data: dict, je9pel_data: dict):
@@ -284,37 +304,30 @@ class SatcomDBGenerator:
                 details["je9pel"] = None
                 logger.debug(f"NORAD CAT ID {norad_cat_id} in JE9PEL but not Satnogs DB. Skipping..")
 
+            # Precomputed once per build so loading the collection needn't scan the nested link arrays
+            details["has_active_downlink"] = details["je9pel"] is not None and any(
+                link["active"] for link in details["je9pel"]["downlink"]
+            )
+
         return data
 
     ## Filter out CW only signals ##
+    @staticmethod
+    def has_non_cw_downlink(tx_profile: dict) -> bool:
+        """Whether the satellite has an active JE9PEL downlink or a non-CW Satnogs downlink (stops at first hit)"""
+        je9pel = tx_profile["je9pel"]
+        if je9pel is not None and any(
+            link["active"] and (link["low"] is not None or link["high"] is not None) for link in je9pel["downlink"]
+        ):
+            return True
+        return any(
+            transmitter["downlink_low"] and transmitter["mode"] and transmitter["mode"].lower() != "cw"
+            for transmitter in tx_profile["transmitters"]
+        )
+
     def filter(self, data: dict) -> dict:
         """Filter out CW only signals"""
-        good_sats = []
-        for k, v in data.items():
-            tx_profile = v
-
-            je9pel_downlinks = []
-            if tx_profile["je9pel"] is not None:
-                for link in tx_profile["je9pel"]["downlink"]:
-                    if link["active"]:
-                        if link["low"] is not None:
-                            je9pel_downlinks.append(link["low"])
-                        elif link["high"] is not None:
-                            je9pel_downlinks.append(link["high"])
-
-            satnogs_downlinks = []
-            for transmitter in tx_profile["transmitters"]:
-                freq = transmitter["downlink_low"]
-                mode = transmitter["mode"]
-                if freq and mode and mode.lower() != "cw":
-                    satnogs_downlinks.append(freq)
-
-            downlinks = set(je9pel_downlinks + satnogs_downlinks)
-            if len(downlinks) > 0:
-                good_sats.append(k)
-
-        return {k: v for k, v in data.items() if k in good_sats}
-
+        return {k: v for k, v in data.items() if self.has_non_cw_downlink(v)}
 
     ## Entrypoint ##
 
@@ -348,19 +361,28 @@ class SatcomDBGenerator:
 
         return data
 
-    def write_db(self, data: dict) -> None:
-        # Export as json
-        self.write_json_to_file(data, self.db_path)
+    def write_db(self, data: dict, pretty: bool = False) -> None:
+        # Export as json; compact unless a human-readable copy is wanted for debugging
+        self.write_json_to_file(data, self.db_path, pretty=pretty)
 
-    def get_cached_db(self):
-        logger.debug("Fetching cached SATCOM database.")
-        with open(self.db_path) as f:
-            d = json.load(f)
-        return d
+    def get_cached_db(self) -> dict:
+        """Return the on-disk SATCOM database, re-parsing only when the file has changed since the last call"""
+        mtime = self.db_path.stat().st_mtime_ns
+        if self._cached_db is None or mtime != self._cached_db_mtime:
+            logger.debug("Fetching cached SATCOM database.")
+            self._cached_db = self.load_json(self.db_path)
+            self._cached_db_mtime = mtime
+        return self._cached_db
 
 
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate the SATCOM database from the local cache")
+    parser.add_argument("--pretty", action="store_true", help="Indent the exported JSON for debugging")
+    args = parser.parse_args()
+
     je9pel = JE9PELGenerator(DBUpdaterConfig)
     generator = SatcomDBGenerator(DBUpdaterConfig, je9pel)
     data = generator.generate_db(use_cache=True)
-    generator.write_db(data)
+    generator.write_db(data, pretty=args.pretty)
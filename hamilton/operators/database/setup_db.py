@@ -1,25 +1,80 @@
-from motor.motor_asyncio import AsyncIOMotorClient
+import asyncio
+
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection
+from pymongo.errors import CollectionInvalid
 from hamilton.operators.database.config import DBUpdaterConfig
 from hamilton.base.config import DBConfig
 
 
+def create_client() -> AsyncIOMotorClient:
+    # Acknowledged but unjournaled writes: a collection rebuild is made atomic by the rename, not by each insert
+    return AsyncIOMotorClient(
+        DBConfig.mongo_uri,
+        compressors=DBConfig.mongo_compressors,
+        maxPoolSize=DBConfig.mongo_max_pool_size,
+        retryWrites=True,
+        w=DBConfig.mongo_write_concern,
+        journal=DBConfig.mongo_journal,
+    )
+
+
 async def setup_db():
-    client = AsyncIOMotorClient(DBConfig.mongo_uri)
+    client = create_client()
     db = client[DBConfig.mongo_db_name]
     return client, db
 
 
+async def create_collection(db, name: str = DBConfig.mongo_collection_name):
+    # Store documents zstd-compressed on disk (WiredTiger defaults to snappy); only applies at creation
+    try:
+        await db.create_collection(
+            name,
+            storageEngine={"wiredTiger": {"configString": f"block_compressor={DBConfig.mongo_block_compressor}"}},
+        )
+    except CollectionInvalid:
+        pass
+
+
+async def create_indexes(db, name: str = DBConfig.mongo_collection_name):
+    await db[name].create_index("norad_cat_id", unique=True)
+
+
 async def init_db(db):
-    await db[DBConfig.mongo_collection_name].create_index("norad_cat_id", unique=True)
+    await create_collection(db)
+    await create_indexes(db)
 
 
 async def setup_and_index_db():
-    client = AsyncIOMotorClient(DBConfig.mongo_uri)
+    client = create_client()
     db = client[DBConfig.mongo_db_name]
-    await db[DBConfig.mongo_collection_name].create_index("norad_cat_id", unique=True)
+    await init_db(db)
     return client, db
 
 
+async def insert_batched(collection: AsyncIOMotorCollection, documents) -> None:
+    """Insert documents as concurrent unordered batches, bounding how many are in flight at once"""
+    documents = list(documents)
+    batch_size = DBConfig.mongo_insert_batch_size
+    semaphore = asyncio.Semaphore(DBConfig.mongo_insert_concurrency)
+
+    async def insert(batch):
+        async with semaphore:
+            await collection.insert_many(batch, ordered=False)
+
+    await asyncio.gather(*(insert(documents[i : i + batch_size]) for i in range(0, len(documents), batch_size)))
+
+
+async def replace_collection(db, documents):
+    """Atomically replace the satcom collection: build and index a staging copy, then rename it over the live one"""
+    name = DBConfig.mongo_collection_name
+    staging_name = f"{name}_staging"
+    await db[staging_name].drop()
+    await create_collection(db, staging_name)
+    await create_indexes(db, staging_name)
+    await insert_batched(db[staging_name], documents)
+    await db[staging_name].rename(name, dropTarget=True)
+
+
 async def main():
     config = DBUpdaterConfig()
     je9pel = JE9PELGenerator(config)
@@ -32,21 +87,12 @@ async def main():
     # client = AsyncIOMotorClient(config.mongo_uri)
     # db = client[config.mongo_db_name]
 
-    # Start a session for the transaction
-    # (ensures delete and insert operations are executed as part of single transaction)
-    async def update_db():
-        async with await client.start_session() as session:
-            async with session.start_transaction():
-                await db[config.mongo_collection_name].delete_many({}, session=session)
-                await db[config.mongo_collection_name].insert_many(data.values(), session=session)
-
-    await update_db()
+    await replace_collection(db, data.values())
 
 
 if __name__ == "__main__":
     from hamilton.operators.database.generators.satcom_db_generator import SatcomDBGenerator
     from hamilton.operators.database.generators.je9pel_generator import JE9PELGenerator
     from hamilton.operators.database.config import DBUpdaterConfig
-    import asyncio
 
     asyncio.run(main())
@@ -2,10 +2,13 @@ import asyncio
 import logging
 import signal
 from pathlib import Path
+from typing import Optional
+from hamilton.base.messages import Message, MessageHandlerType
 from hamilton.operators.database.config import DBUpdaterConfig
 from hamilton.messaging.async_message_node_operator import AsyncMessageNodeOperator
+from hamilton.messaging.interfaces import MessageHandler
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
-from hamilton.operators.database.setup_db import setup_and_index_db
+from hamilton.operators.database.setup_db import replace_collection, setup_and_index_db
 from hamilton.operators.database.generators.je9pel_generator import JE9PELGenerator
 from hamilton.operators.database.generators.satcom_db_generator import SatcomDBGenerator
 from hamilton.operators.astrodynamics.client import AstrodynamicsClient
@@ -13,11 +16,28 @@ from hamilton.operators.astrodynamics.client import AstrodynamicsClient
 logger = logging.getLogger(__name__)
 
 
+class DBUpdaterCommandHandler(MessageHandler):
+    """Triggers an out-of-schedule database update on request"""
+
+    def __init__(self, updater: "DBUpdater"):
+        super().__init__(message_type=MessageHandlerType.COMMAND)
+        self.updater = updater
+        self.routing_key_base = "observatory.database.telemetry"
+
+    async def handle_message(self, message: Message, correlation_id: Optional[str] = None) -> None:
+        if message["payload"]["commandType"] == "update":
+            self.updater.request_update()
+            routing_key = f"{self.routing_key_base}.update"
+            telemetry_msg = self.node_operations.msg_generator.generate_telemetry("update", {"status": "requested"})
+            await self.node_operations.publish_message(routing_key, telemetry_msg, correlation_id)
+
+
 class DBUpdater(AsyncMessageNodeOperator):
     def __init__(self, config: DBUpdaterConfig = None, shutdown_event: asyncio.Event = None):
         if config is None:
             config = DBUpdaterConfig()
-        super().__init__(config=config, shutdown_event=shutdown_event)
+        handlers = [DBUpdaterCommandHandler(self)]
+        super().__init__(config=config, handlers=handlers, shutdown_event=shutdown_event)
         je9pel = JE9PELGenerator(config)
         self.db_generator = SatcomDBGenerator(config, je9pel)
         self.config = config
@@ -26,6 +46,7 @@ class DBUpdater(AsyncMessageNodeOperator):
         self.db_client: AsyncIOMotorClient = None
         self.db: AsyncIOMotorDatabase = None
         self.astrodynamics = AstrodynamicsClient()
+        self._update_requested = asyncio.Event()
 
     async def _setup_and_index_db(self):
         self.db_client, self.db = await setup_and_index_db()
@@ -35,21 +56,25 @@ class DBUpdater(AsyncMessageNodeOperator):
         message = self.msg_generator.generate_telemetry("update", {"status": status})
         await self.publish_message(routing_key, message)
 
+    def request_update(self) -> None:
+        """Wake the update loop to regenerate the database now rather than at the next interval"""
+        logger.info("Database update requested.")
+        self._update_requested.set()
+
     async def update_database(self):
+        # Requests arriving from here on trigger another pass once this one completes
+        self._update_requested.clear()
+
         # Send telemetry indicating db update started
         logger.info("Updating database...")
         await self._publish_db_update_telemetry("started")
 
-        # Generate new db
-        data = self.db_generator.generate_db(use_cache=False)
+        # Generate new db (blocking downloads and pandas work, so keep it off the event loop)
+        data = await asyncio.to_thread(self.db_generator.generate_db, use_cache=False)
+
+        # Swap in the new collection in one rename (readers see either the old or the new data, never a mix)
+        await replace_collection(self.db, data.values())
 
-        # Start a session for the transaction
-        # (ensures delete and insert operations are executed as part of single transaction)
-        async with await self.db_client.start_session() as session:
-            async with session.start_transaction():
-                await self.db[self.config.mongo_collection_name].delete_many({}, session=session)
-                await self.db[self.config.mongo_collection_name].insert_many(data.values(), session=session)
-            
         # Recompute all orbits in Astrodynamics service
         await self.astrodynamics.recompute_all_orbits()
 
@@ -62,18 +87,23 @@ class DBUpdater(AsyncMessageNodeOperator):
         await self._setup_and_index_db()
         await self.astrodynamics.start()
 
-        while not shutdown_event.is_set():
-            await self.update_database()
-
-            sleep_task = asyncio.create_task(asyncio.sleep(self.config.UPDATE_INTERVAL))
-            shutdown_task = asyncio.create_task(shutdown_event.wait())
-
-            # Wait either for the interval to pass or for the shutdown event to be set
-            done, pending = await asyncio.wait([sleep_task, shutdown_task], return_when=asyncio.FIRST_COMPLETED)
-
-            # Cancel any pending tasks (if shutdown event was triggered before sleep finished)
-            for task in pending:
-                task.cancel()
+        # A single long-lived watcher lets shutdown wake the loop below, which otherwise waits on one event
+        shutdown_watcher = asyncio.create_task(self._wake_on_shutdown())
+        try:
+            while not shutdown_event.is_set():
+                await self.update_database()
+
+                # Wait for the interval to pass, an update request, or the shutdown event to be set
+                try:
+                    await asyncio.wait_for(self._update_requested.wait(), timeout=self.config.UPDATE_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            shutdown_watcher.cancel()
+
+    async def _wake_on_shutdown(self) -> None:
+        await shutdown_event.wait()
+        self._update_requested.set()
 
     async def stop(self) -> None:
         await self.node.stop()
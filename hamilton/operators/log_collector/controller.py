@@ -1,17 +1,72 @@
 import asyncio
-import json
 import logging
+import os
 import signal
 from logging.handlers import RotatingFileHandler
 from pathlib import Path
 from typing import Optional
 
 from hamilton.base.messages import Message, MessageHandlerType
-from hamilton.common.utils import CustomJSONEncoder
+from hamilton.common.utils import json_dumps
 from hamilton.operators.log_collector.config import LogCollectorConfig
 from hamilton.messaging.async_message_node_operator import AsyncMessageNodeOperator
 from hamilton.messaging.interfaces import MessageHandler
 
+class BufferedRotatingFileHandler(RotatingFileHandler):
+    """
+    RotatingFileHandler that queues formatted records in memory and writes them with a single write per flush. Rollover
+    is checked once per flush against a tracked file size instead of a seek/tell per record; only a batch that crosses
+    maxBytes is split, at record boundaries, so each file still stays within maxBytes.
+    """
+
+    def __init__(self, filename, maxBytes=0, backupCount=0, encoding=None):
+        super().__init__(filename, maxBytes=maxBytes, backupCount=backupCount, encoding=encoding)
+        self.buffer: list[str] = []
+        self.file_size = os.path.getsize(self.baseFilename) if os.path.exists(self.baseFilename) else 0
+
+    def emit(self, record):
+        try:
+            self.buffer.append(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        self.acquire()
+        try:
+            if not self.buffer or self.stream is None:
+                return
+            records, self.buffer = self.buffer, []
+            data = "".join(records)
+            size = len(data.encode(self.stream.encoding))
+            if self.maxBytes > 0 and self.file_size + size >= self.maxBytes:
+                # Rare path: split the batch at the record where each file would pass maxBytes
+                self._write_rolling(records)
+            else:
+                self._write(data, size)
+        finally:
+            self.release()
+
+    def _write(self, data: str, size: int):
+        self.stream.write(data)
+        self.stream.flush()
+        self.file_size += size
+
+    def _write_rolling(self, records: list[str]):
+        encoding = self.stream.encoding
+        chunk, chunk_size = [], 0
+        for record in records:
+            size = len(record.encode(encoding))
+            if self.file_size + chunk_size > 0 and self.file_size + chunk_size + size >= self.maxBytes:
+                if chunk:
+                    self._write("".join(chunk), chunk_size)
+                    chunk, chunk_size = [], 0
+                self.doRollover()
+                self.file_size = 0
+            chunk.append(record)
+            chunk_size += size
+        if chunk:
+            self._write("".join(chunk), chunk_size)
+
 class LogHandler(MessageHandler):
     """Writes all messages to log file paths based on message type and source hierarchy"""
 
@@ -21,7 +76,36 @@ class LogHandler(MessageHandler):
         self.root_log_dir = Path(config.root_log_dir).expanduser()
         self.max_log_size: int = config.max_log_size
         self.backup_count: int = config.backup_count
+        self.flush_interval: float = config.flush_interval
         self.loggers = {}  # Cache loggers based on path
+        self.file_handlers: list[BufferedRotatingFileHandler] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        # Cache the four destination loggers per (message type, source), so each message skips path building
+        self.destinations: dict[tuple[str, str], tuple[logging.Logger, ...]] = {}
+        self.startup_hooks = [self._start_flushing]
+        self.shutdown_hooks = [self._stop_flushing]
+
+    def flush(self) -> None:
+        for handler in self.file_handlers:
+            handler.flush()
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            self.flush()
+
+    async def _start_flushing(self) -> None:
+        self._flush_task = asyncio.create_task(self._flush_periodically())
+
+    async def _stop_flushing(self) -> None:
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        self.flush()
 
     async def get_logger(self, log_path: Path) -> logging.Logger:
         if log_path not in self.loggers:
@@ -33,10 +117,13 @@ class LogHandler(MessageHandler):
             logger.setLevel(logging.INFO)
 
             # Add rotating file handler
-            handler = RotatingFileHandler(filename=log_path, maxBytes=self.max_log_size, backupCount=self.backup_count)
+            handler = BufferedRotatingFileHandler(
+                filename=log_path, maxBytes=self.max_log_size, backupCount=self.backup_count
+            )
             formatter = logging.Formatter("%(message)s")
             handler.setFormatter(formatter)
             logger.addHandler(handler)
+            self.file_handlers.append(handler)
 
             # Avoid propagating messages to the root logger
             logger.propagate = False
@@ -48,22 +135,28 @@ class LogHandler(MessageHandler):
         logger = await self.get_logger(log_path)
         logger.info(message)
 
+    async def get_destinations(self, message_type: str, source: str) -> tuple[logging.Logger, ...]:
+        key = (message_type, source)
+        if key not in self.destinations:
+            # Paths for log files
+            all_log_path = self.root_log_dir / "all.log"
+            type_log_path = self.root_log_dir / f"{message_type}.log"
+            source_all_log_path = self.root_log_dir / source.lower() / "all.log"
+            source_type_log_path = self.root_log_dir / source.lower() / f"{message_type}.log"
+            log_paths = (all_log_path, type_log_path, source_all_log_path, source_type_log_path)
+            self.destinations[key] = tuple([await self.get_logger(log_path) for log_path in log_paths])
+
+        return self.destinations[key]
+
     async def handle_message(self, message: Message, correlation_id: Optional[str] = None) -> None:
         message_type = message["messageType"]
         source = message["source"]
-        message_out = json.dumps(message, cls=CustomJSONEncoder)
-
-        # Paths for log files
-        all_log_path = self.root_log_dir / "all.log"
-        type_log_path = self.root_log_dir / f"{message_type}.log"
-        source_all_log_path = self.root_log_dir / source.lower() / "all.log"
-        source_type_log_path = self.root_log_dir / source.lower() / f"{message_type}.log"
+        # orjson, with the same extra types as CustomJSONEncoder; written as compact one-line JSON records
+        message_out = json_dumps(message).decode()
 
         # Write messages
-        await self.write_message(message_out, all_log_path)
-        await self.write_message(message_out, type_log_path)
-        await self.write_message(message_out, source_all_log_path)
-        await self.write_message(message_out, source_type_log_path)
+        for logger in await self.get_destinations(message_type, source):
+            logger.info(message_out)
 
 class LogCollector(AsyncMessageNodeOperator):
     def __init__(self, config: LogCollectorConfig = None, shutdown_event: asyncio.Event = None):
@@ -3,11 +3,16 @@ This is a python interface to the Alfa ROT2Prog Controller.
 """
 import logging
 import time
-from threading import Lock, Thread
 
 import serial
 
 
+# Fixed command packets (and the set template, whose position bytes are filled in per call)
+_STOP_PACKET = bytes((0x57, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x0F, 0x20))
+_STATUS_PACKET = bytes((0x57, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x1F, 0x20))
+_SET_PACKET_TEMPLATE = bytes((0x57, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x2F, 0x20))
+
+
 class ReadTimeout(Exception):
 
     """A serial read timed out."""
@@ -30,10 +35,10 @@ class ROT2Prog:
 
     _ser = None
 
-    _divisor_lock = Lock()
+    # Both are only ever rebound whole (an int, a 4-tuple), which is atomic, so readers need no lock
     _divisor = 10
 
-    _limits_lock = Lock()
+    _limits = (0, 540, 10, 170)
 
     def __init__(self, port="/dev/ttyUSB0", timeout=5):
         """Creates object and opens serial connection.
@@ -53,9 +58,7 @@ class ROT2Prog:
             inter_byte_timeout=0.1,  # inter_byte_timeout allows continued operation after a bad packet
         )
 
-        self._log.debug(
-            "'" + str(self._ser.name) + "' opened with " + str(timeout) + "s timeout"
-        )
+        self._log.debug("'%s' opened with %ss timeout", self._ser.name, timeout)
 
         # get resolution from controller
         self.status()
@@ -66,12 +69,11 @@ class ROT2Prog:
         """Sends a command packet.
 
         Args:
-            command_packet (list of int): Command packet queued.
+            command_packet (bytes or bytearray): Command packet queued.
         """
-        self._ser.write(bytearray(command_packet))
-        self._log.debug(
-            "Command packet sent: " + str(list(map(hex, list(command_packet))))
-        )
+        self._ser.write(command_packet)
+        if self._log.isEnabledFor(logging.DEBUG):
+            self._log.debug("Command packet sent: %s", list(map(hex, command_packet)))
 
     def _recv_response(self):
         """Receives a response packet.
@@ -83,13 +85,12 @@ class ROT2Prog:
             PacketError: The response packet is incomplete or contains bad values.
             ReadTimeout: The controller was unresponsive.
         """
-        # read with timeout
-        response_packet = list(self._ser.read(12))
+        # read with timeout (bytes index straight to ints, so no list copy is needed)
+        response_packet = self._ser.read(12)
 
         # attempt to receive 12 bytes, the length of response packet
-        self._log.debug(
-            "Response packet received: " + str(list(map(hex, list(response_packet))))
-        )
+        if self._log.isEnabledFor(logging.DEBUG):
+            self._log.debug("Response packet received: %s", list(map(hex, response_packet)))
         if len(response_packet) != 12:
             if len(response_packet) == 0:
                 raise ReadTimeout("Response timed out")
@@ -100,8 +101,11 @@ class ROT2Prog:
             AZ_DIVISOR = response_packet[5]
             EL_DIVISOR = response_packet[10]
 
-            az = int("".join(str(i) for i in response_packet[1:5])) / AZ_DIVISOR - 360
-            el = int("".join(str(i) for i in response_packet[6:10])) / EL_DIVISOR - 360
+            # positions arrive as four decimal digit values (0-9), most significant first
+            az_raw = response_packet[1] * 1000 + response_packet[2] * 100 + response_packet[3] * 10 + response_packet[4]
+            el_raw = response_packet[6] * 1000 + response_packet[7] * 100 + response_packet[8] * 10 + response_packet[9]
+            az = az_raw / AZ_DIVISOR - 360
+            el = el_raw / EL_DIVISOR - 360
 
             az = float(round(az, 1))
             el = float(round(el, 1))
@@ -117,14 +121,13 @@ class ROT2Prog:
                     + ")"
                 )
             else:
-                with self._divisor_lock:
-                    self._divisor = AZ_DIVISOR
+                self._divisor = AZ_DIVISOR
 
             self._log.debug("Received response")
-            self._log.debug("-> AZ: " + str(az) + "°")
-            self._log.debug("-> EL: " + str(el) + "°")
-            self._log.debug("-> AZ_DIVISOR: " + str(AZ_DIVISOR))
-            self._log.debug("-> EL_DIVISOR: " + str(EL_DIVISOR))
+            self._log.debug("-> AZ: %s°", az)
+            self._log.debug("-> EL: %s°", el)
+            self._log.debug("-> AZ_DIVISOR: %s", AZ_DIVISOR)
+            self._log.debug("-> EL_DIVISOR: %s", EL_DIVISOR)
 
             return (az, el)
 
@@ -136,22 +139,7 @@ class ROT2Prog:
         """
         self._log.debug("Stop command queued")
 
-        cmd = [
-            0x57,
-            0x00,
-            0x00,
-            0x00,
-            0x00,
-            0x00,
-            0x00,
-            0x00,
-            0x00,
-            0x00,
-            0x00,
-            0x0F,
-            0x20,
-        ]
-        self._send_command(cmd)
+        self._send_command(_STOP_PACKET)
         return self._recv_response()
 
     def status(self):
@@ -162,22 +150,7 @@ class ROT2Prog:
         """
         self._log.debug("Status command queued")
 
-        cmd = [
-            0x57,
-            0x00,
-            0x00,
-            0x00,
-            0x00,
-            0x00,
-            0x00,
-            0x00,
-            0x00,
-            0x00,
-            0x00,
-            0x1F,
-            0x20,
-        ]
-        self._send_command(cmd)
+        self._send_command(_STATUS_PACKET)
         return self._recv_response()
 
     def set(self, az, el):
@@ -194,56 +167,51 @@ class ROT2Prog:
         az = float(az)
         el = float(el)
 
-        with self._limits_lock:
-            if az > self._max_az or az < self._min_az:
-                raise ValueError(
-                    "Azimuth of "
-                    + str(az)
-                    + "° is out of range ["
-                    + str(self._min_az)
-                    + "°, "
-                    + str(self._max_az)
-                    + "°]"
-                )
-            if el > self._max_el or el < self._min_el:
-                raise ValueError(
-                    "Elevation of "
-                    + str(el)
-                    + "° is out of range ["
-                    + str(self._min_el)
-                    + "°, "
-                    + str(self._max_el)
-                    + "°]"
-                )
+        min_az, max_az, min_el, max_el = self._limits
+        if az > max_az or az < min_az:
+            raise ValueError(
+                "Azimuth of "
+                + str(az)
+                + "° is out of range ["
+                + str(min_az)
+                + "°, "
+                + str(max_az)
+                + "°]"
+            )
+        if el > max_el or el < min_el:
+            raise ValueError(
+                "Elevation of "
+                + str(el)
+                + "° is out of range ["
+                + str(min_el)
+                + "°, "
+                + str(max_el)
+                + "°]"
+            )
 
         self._log.debug("Set command queued")
-        self._log.debug("-> AZ: " + str(round(az, 1)) + "°")
-        self._log.debug("-> EL: " + str(round(el, 1)) + "°")
+        if self._log.isEnabledFor(logging.DEBUG):
+            self._log.debug("-> AZ: %s°", round(az, 1))
+            self._log.debug("-> EL: %s°", round(el, 1))
 
         # encode with resolution
-        with self._divisor_lock:
-            divisor = self._divisor
-
-        # form coordinates as strings
-        H = str(int(divisor * (round(az, 1) + 360)))
-        V = str(int(divisor * (round(el, 1) + 360)))
-
-        # build command
-        cmd = [
-            0x57,
-            int(H[0]) + 0x30,
-            int(H[1]) + 0x30,
-            int(H[2]) + 0x30,
-            int(H[3]) + 0x30,
-            divisor,
-            int(V[0]) + 0x30,
-            int(V[1]) + 0x30,
-            int(V[2]) + 0x30,
-            int(V[3]) + 0x30,
-            divisor,
-            0x2F,
-            0x20,
-        ]
+        divisor = self._divisor
+
+        # encode coordinates as offset positions
+        H = int(divisor * (round(az, 1) + 360))
+        V = int(divisor * (round(el, 1) + 360))
+
+        # build command (positions are sent as four ASCII decimal digits, most significant first)
+        cmd = bytearray(_SET_PACKET_TEMPLATE)
+        cmd[1] = 0x30 + H // 1000 % 10
+        cmd[2] = 0x30 + H // 100 % 10
+        cmd[3] = 0x30 + H // 10 % 10
+        cmd[4] = 0x30 + H % 10
+        cmd[6] = 0x30 + V // 1000 % 10
+        cmd[7] = 0x30 + V // 100 % 10
+        cmd[8] = 0x30 + V // 10 % 10
+        cmd[9] = 0x30 + V % 10
+        cmd[5] = cmd[10] = divisor
 
         self._send_command(cmd)
         return self._recv_response()
@@ -254,8 +222,7 @@ class ROT2Prog:
         Returns:
             min_az (float), max_az (float), min_el (float), max_el (float): Tuple of minimum and maximum azimuth and elevation.
         """
-        with self._limits_lock:
-            return (self._min_az, self._max_az, self._min_el, self._max_el)
+        return self._limits
 
     def set_limits(self, min_az=0, max_az=540, min_el=10, max_el=170):
         """Sets the minimum and maximum limits for azimuth and elevation.
@@ -266,11 +233,7 @@ class ROT2Prog:
             min_el (int, optional): Minimum elevation. Defaults to -21.
             max_el (int, optional): Maximum elevation. Defaults to 180.
         """
-        with self._limits_lock:
-            self._min_az = min_az
-            self._max_az = max_az
-            self._min_el = min_el
-            self._max_el = max_el
+        self._limits = (min_az, max_az, min_el, max_el)
 
     def get_pulses_per_degree(self):
         """Returns the number of pulses per degree.
@@ -278,5 +241,4 @@ class ROT2Prog:
         Returns:
             int: Pulses per degree defining the resolution of the controller.
         """
-        with self._divisor_lock:
-            return self._divisor
\ No newline at end of file
+        return self._divisor
\ No newline at end of file
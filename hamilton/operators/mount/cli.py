@@ -2,28 +2,59 @@
 
 import argparse
 import asyncio
-from hamilton.operators.mount.client import MountClient
+import json
 import logging
+import socket
+from typing import Optional
+
+from hamilton.common.utils import json_dumps
+from hamilton.operators.mount.client import MountClient
+from hamilton.operators.mount.clid import execute_request, socket_dir_is_private
+from hamilton.operators.mount.config import MountClientConfig
 
 
 root_logger = logging.getLogger()
 root_logger.setLevel(logging.WARNING)
 
 
-async def handle_command(args):
+def build_request(args) -> dict:
+    """Translate parsed CLI arguments into a mount client request (see clid.py for the format)"""
+    if args.command == "set":
+        parameters = {"azimuth": args.azimuth, "elevation": args.elevation}
+    elif args.command == "batch":
+        with args.script as script:
+            parameters = {"commands": json.load(script)}
+    else:
+        parameters = {}
+    return {"command": args.command, "parameters": parameters, "timeout": args.rpc_timeout}
+
+
+def send_to_daemon(request: dict, socket_path: str) -> Optional[str]:
+    """Run the request on a running mount client daemon, returning its raw reply, or None if none is listening"""
+    # A socket in a directory other users can write to may not be the daemon's; don't send it anything
+    if not socket_dir_is_private(socket_path):
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(socket_path)
+            sock.sendall(json.dumps(request).encode() + b"\n")
+            with sock.makefile("rb") as reply:
+                return reply.readline().decode().rstrip("\n")
+    except (FileNotFoundError, ConnectionRefusedError):
+        return None
+
+
+async def handle_command(request: dict):
     client = MountClient()
 
     try:
         await client.start()
-        if args.command == "set":
-            params = {"az": args.azimuth, "el": args.elevation}
-            response = await client.set(**params)
-        elif args.command == "status":
-            response = await client.status()
-        elif args.command == "stop":
-            response = await client.stop_rotor()
-
-        print(response)
+        try:
+            response = await execute_request(client, request)
+        except Exception as e:
+            response = {"error": str(e)}
+        # Print the same JSON line the daemon would have replied with
+        print(json_dumps(response).decode())
     finally:
         await client.stop()
 
@@ -34,6 +65,12 @@ if __name__ == "__main__":
         description="Control the mount system using various commands",
         formatter_class=argparse.RawTextHelpFormatter,
     )
+    parser.add_argument(
+        "--rpc-timeout",
+        type=float,
+        default=10.0,
+        help="Seconds to wait for a reply to status and batch commands,\nor for the broker to accept set and stop commands (default: 10)",
+    )
     subparsers = parser.add_subparsers(dest="command", title="Commands", metavar="<command>")
 
     # Subparser for the 'set' command
@@ -47,9 +84,22 @@ if __name__ == "__main__":
     # Subparser for the 'stop' command
     parser_stop = subparsers.add_parser("stop", help="Stop the mount controller")
 
+    # Subparser for the 'batch' command
+    parser_batch = subparsers.add_parser(
+        "batch",
+        help='Run a JSON list of commands in one request, e.g.\n[{"command": "set", "parameters": {"azimuth": 270, "elevation": 90}}, {"command": "status"}]',
+    )
+    parser_batch.add_argument("script", type=argparse.FileType("r"), help="JSON file of commands ('-' for stdin)")
+
     args = parser.parse_args()
 
     if args.command:
-        asyncio.run(handle_command(args))
+        request = build_request(args)
+        # Prefer the long-lived daemon's connection; start a client of our own only if it isn't running
+        reply = send_to_daemon(request, MountClientConfig.CLI_SOCKET_PATH)
+        if reply is not None:
+            print(reply)
+        else:
+            asyncio.run(handle_command(request))
     else:
         parser.print_help()
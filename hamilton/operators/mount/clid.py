@@ -0,0 +1,129 @@
+"""
+Mount client daemon. Keeps one connected MountClient alive and serves the mount CLI over a Unix socket, so each CLI
+invocation reuses the daemon's AMQP connection instead of opening (and tearing down) its own.
+
+Protocol: one JSON object per line, {"command": ..., "parameters": {...}, "timeout": ...}, answered by one JSON line
+holding the command's response (or {"error": ...}).
+
+The socket lives in a directory that only the daemon's user may access, so no other user can plant or replace it.
+"""
+
+import asyncio
+import logging
+import os
+import signal
+import stat
+from pathlib import Path
+
+from hamilton.common.utils import json_dumps, json_loads
+from hamilton.operators.mount.client import MountClient
+from hamilton.operators.mount.config import MountClientConfig
+
+logger = logging.getLogger(__name__)
+
+
+# Command -> coroutine issuing it on a started client
+COMMANDS = {
+    "set": lambda client, parameters, timeout: client.set(
+        parameters["azimuth"], parameters["elevation"], timeout=timeout
+    ),
+    "status": lambda client, parameters, timeout: client.status(timeout=timeout),
+    "stop": lambda client, parameters, timeout: client.stop_rotor(timeout=timeout),
+    "batch": lambda client, parameters, timeout: client.batch(parameters["commands"], timeout=timeout),
+}
+
+
+def socket_dir_is_private(socket_path: str | Path) -> bool:
+    """Whether the socket's directory exists, belongs to the current user and is closed to everyone else"""
+    try:
+        dir_stat = Path(socket_path).parent.lstat()
+    except FileNotFoundError:
+        return False
+    return stat.S_ISDIR(dir_stat.st_mode) and dir_stat.st_uid == os.getuid() and not dir_stat.st_mode & 0o077
+
+
+async def execute_request(client: MountClient, request: dict):
+    command = COMMANDS[request["command"]]
+    return await command(client, request.get("parameters", {}), request.get("timeout", 10))
+
+
+class MountClientDaemon:
+    def __init__(self, client: MountClient, socket_path: str | Path):
+        self.client = client
+        self.socket_path = Path(socket_path)
+        self.server: asyncio.AbstractServer = None
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while line := await reader.readline():
+                try:
+                    response = await execute_request(self.client, json_loads(line))
+                except Exception as e:
+                    logger.error(f"Failed to execute CLI request {line!r}: {e}")
+                    response = {"error": str(e)}
+                writer.write(json_dumps(response) + b"\n")
+                await writer.drain()
+        finally:
+            writer.close()
+            await writer.wait_closed()
+
+    async def start(self):
+        self.socket_path.parent.mkdir(mode=0o700, exist_ok=True)
+        if not socket_dir_is_private(self.socket_path):
+            raise RuntimeError(f"{self.socket_path.parent} must be a directory owned by this user with mode 0700")
+
+        # Refuse to take over a socket that something still answers on; only a stale one is removed (it would
+        # otherwise make the bind fail)
+        try:
+            _, writer = await asyncio.open_unix_connection(str(self.socket_path))
+        except (FileNotFoundError, ConnectionRefusedError):
+            self.socket_path.unlink(missing_ok=True)
+        else:
+            writer.close()
+            await writer.wait_closed()
+            raise RuntimeError(f"Another process is already serving {self.socket_path}")
+
+        self.server = await asyncio.start_unix_server(self._handle_connection, path=str(self.socket_path))
+        logger.info(f"Serving mount CLI requests on {self.socket_path}")
+
+    async def stop(self):
+        # Only remove the socket if we bound it; a refused start must leave the serving process's socket alone
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.socket_path.unlink(missing_ok=True)
+
+
+shutdown_event = asyncio.Event()
+
+
+def signal_handler():
+    shutdown_event.set()
+
+
+async def main():
+    # Setup signal handlers for graceful shutdown
+    loop = asyncio.get_running_loop()
+    for signame in ("SIGINT", "SIGTERM"):
+        loop.add_signal_handler(getattr(signal, signame), signal_handler)
+
+    # Application setup
+    config = MountClientConfig()
+    client = MountClient(config, shutdown_event=shutdown_event)
+    daemon = MountClientDaemon(client, config.CLI_SOCKET_PATH)
+
+    try:
+        await client.start()
+        await daemon.start()
+        await shutdown_event.wait()  # Wait for the shutdown signal
+
+    except Exception as e:
+        print(f"An unexpected error occurred: {e}")
+
+    finally:
+        await daemon.stop()
+        await client.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -2,11 +2,20 @@ import asyncio
 import signal
 from typing import Optional
 
+import orjson
+
 from hamilton.base.messages import MessageHandlerType, Message
 from hamilton.operators.mount.config import MountClientConfig
 from hamilton.messaging.async_message_node_operator import AsyncMessageNodeOperator
 from hamilton.messaging.interfaces import MessageHandler
 
+COMMANDS = ("set", "status", "stop", "batch")
+
+# Payloads of the parameterless commands never change, so they are serialized once and embedded verbatim
+_FIXED_PAYLOADS = {
+    command: orjson.Fragment(orjson.dumps({"commandType": command, "parameters": {}})) for command in ("status", "stop")
+}
+
 
 class MountTelemetryHandler(MessageHandler):
     def __init__(self):
@@ -23,44 +32,62 @@ class MountClient(AsyncMessageNodeOperator):
         handlers = [MountTelemetryHandler()]
         super().__init__(config, handlers, shutdown_event)
         self.routing_key_base = "observatory.mount.command"
-
-    async def _publish_command(self, command: str, parameters: dict, rpc: bool = True) -> dict:
-        routing_key = f"{self.routing_key_base}.{command}"
-        message = self.msg_generator.generate_command(command, parameters)
+        # Routing keys are fixed per command, so build them once and check them against the config up front
+        self.routing_keys = {command: f"{self.routing_key_base}.{command}" for command in COMMANDS}
+        published = {routing_key for publishing in config.publishings for routing_key in publishing.routing_keys}
+        unpublished = sorted(set(self.routing_keys.values()) - published)
+        if unpublished:
+            raise ValueError(f"{config.name} has no publishing configured for routing keys {unpublished}")
+
+    async def _publish_command(self, command: str, parameters: dict, rpc: bool = True, timeout: float = 10) -> dict:
+        routing_key = self.routing_keys[command]
+        if not parameters and command in _FIXED_PAYLOADS:
+            message = self.msg_generator.generate_message("command", _FIXED_PAYLOADS[command])
+        else:
+            message = self.msg_generator.generate_command(command, parameters)
         if rpc:
-            response = await self.publish_rpc_message(routing_key, message)
+            response = await self.publish_rpc_message(routing_key, message, timeout=timeout)
         else:
-            response = await self.publish_message(routing_key, message)
+            # No reply is coming, so the timeout bounds the publish itself (the broker's publisher confirm)
+            response = await asyncio.wait_for(self.publish_message(routing_key, message), timeout)
         return response
 
-    async def status(self):
+    async def status(self, timeout: float = 10):
         command = "status"
         parameters = {}
-        return await self._publish_command(command, parameters)
+        return await self._publish_command(command, parameters, timeout=timeout)
 
-    async def set(self, az, el):
+    async def set(self, az, el, timeout: float = 10):
         command = "set"
         parameters = {"azimuth": az, "elevation": el}
-        return await self._publish_command(command, parameters, rpc=False)
+        return await self._publish_command(command, parameters, rpc=False, timeout=timeout)
 
-    async def stop_rotor(self):
+    async def stop_rotor(self, timeout: float = 10):
         command = "stop"
         parameters = {}
-        return await self._publish_command(command, parameters, rpc=False)
+        return await self._publish_command(command, parameters, rpc=False, timeout=timeout)
+
+    async def batch(self, commands: list[dict], timeout: float = 10):
+        """Run several commands, e.g. [{"command": "set", "parameters": {...}}, {"command": "status"}], in one RPC"""
+        command = "batch"
+        parameters = {"commands": commands}
+        return await self._publish_command(command, parameters, timeout=timeout)
 
 
 shutdown_event = asyncio.Event()
 
 
-def signal_handler():
+def signal_handler(main_task: asyncio.Task):
     shutdown_event.set()
+    # Also interrupt whatever main() is awaiting (e.g. the AMQP connect in start()), not just later event checks
+    main_task.cancel()
 
 
 async def main():
     # Setup signal handlers for graceful shutdown
     loop = asyncio.get_running_loop()
     for signame in ("SIGINT", "SIGTERM"):
-        loop.add_signal_handler(getattr(signal, signame), signal_handler)
+        loop.add_signal_handler(getattr(signal, signame), signal_handler, asyncio.current_task())
 
     # Application setup
     client = MountClient(shutdown_event=shutdown_event)
@@ -68,11 +95,15 @@ async def main():
     try:
         await client.start()
 
-        response = await client.status()
-        print(response)
+        # Issue both commands concurrently; the group cancels whichever is still running if the other fails
+        async with asyncio.TaskGroup() as tg:
+            status_task = tg.create_task(client.status())
+            stop_task = tg.create_task(client.stop_rotor())
+        print(status_task.result())
+        print(stop_task.result())
 
-        response = await client.stop_rotor()
-        print(response)
+    except asyncio.CancelledError:
+        print("Interrupted, shutting down.")
 
     except Exception as e:
         print(f"An unexpected error occurred: {e}")
@@ -1,3 +1,5 @@
+import os
+
 from hamilton.base.config import MessageNodeConfig, Exchange, Binding, Publishing
 
 
@@ -10,10 +12,18 @@ class MountControllerConfig(MessageNodeConfig):
         Binding(exchange="mount", routing_keys=["observatory.mount.command.*"]),
     ]
     publishings = [
-        Publishing(exchange="mount", rpc=False, routing_keys=["observatory.mount.telemetry.azel"]),
+        Publishing(
+            exchange="mount",
+            rpc=False,
+            routing_keys=["observatory.mount.telemetry.azel", "observatory.mount.telemetry.batch"],
+        ),
     ]
 
+    prefetch_count = 50  # Bound unacked commands in flight; the serial link serves them one at a time anyway
+    ack_batch_size = 10  # Acknowledge command bursts with one multi-ack per 10 deliveries
+
     DEVICE_ADDRESS = "/dev/usbttymd01"
+    AZEL_REPEAT_INTERVAL = 10  # Unchanged uncorrelated azel telemetry is republished only after 10 suppressed repeats
 
 
 class MountClientConfig(MessageNodeConfig):
@@ -32,6 +42,10 @@ class MountClientConfig(MessageNodeConfig):
                 "observatory.mount.command.set",
                 "observatory.mount.command.status",
                 "observatory.mount.command.stop",
+                "observatory.mount.command.batch",
             ],
         ),
     ]
+
+    # Unix socket served by clid.py for the mount CLI, inside a directory private to the user running both
+    CLI_SOCKET_PATH = f"/tmp/hamilton-{os.getuid()}/mount.sock"
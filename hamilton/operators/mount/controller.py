@@ -1,5 +1,7 @@
 import asyncio
+import logging
 import signal
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 from hamilton.base.messages import Message, MessageHandlerType
@@ -8,40 +10,78 @@ from hamilton.operators.mount.config import MountControllerConfig
 from hamilton.messaging.async_message_node_operator import AsyncMessageNodeOperator
 from hamilton.messaging.interfaces import MessageHandler
 
+logger = logging.getLogger(__name__)
+
 
 class MountCommandHandler(MessageHandler):
-    def __init__(self, mount_driver: ROT2Prog):
+    def __init__(self, mount_driver: ROT2Prog, azel_repeat_interval: int = 10):
         super().__init__(message_type=MessageHandlerType.COMMAND)
         self.mount: ROT2Prog = mount_driver
+        # Last published azel and how many identical ones have been suppressed since, doubling as a heartbeat count
+        self.azel_repeat_interval = azel_repeat_interval
+        self._last_azel: Optional[tuple[float, float]] = None
+        self._azel_suppressed = 0
+        # Serial I/O blocks for up to the read timeout; a single worker keeps it off the event loop while
+        # preserving the one-command-at-a-time ordering the controller expects
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rot2prog")
         self.shutdown_hooks = [self.stop_rotor]
         self.routing_key_base = "observatory.mount.telemetry"
+        # Command -> (telemetry type it answers with, or None; parameters -> blocking driver call args)
+        self._dispatch = {
+            "set": ("azel", lambda p: (self.mount.set, p.get("azimuth"), p.get("elevation"))),
+            "status": ("azel", lambda p: (self.mount.status,)),
+            "stop": (None, lambda p: (self.mount.stop,)),
+        }
 
     async def stop_rotor(self):
-        self.mount.stop()
+        try:
+            await self.run_serial(self.mount.stop)
+        finally:
+            self.executor.shutdown(wait=False)
+
+    async def run_serial(self, func, *args):
+        """Run a blocking ROT2Prog call on the serial worker thread"""
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    async def execute(self, command: str, parameters: dict) -> tuple[Optional[str], Optional[dict]]:
+        """Run a single mount command, returning its telemetry type and parameters (None if it reports nothing)"""
+        entry = self._dispatch.get(command)
+        if entry is None:
+            return None, None
+
+        telemetry_type, build_call = entry
+        az, el = await self.run_serial(*build_call(parameters))
+        if telemetry_type is None:
+            return None, None
+        return telemetry_type, {"azimuth": az, "elevation": el}
 
     async def handle_message(self, message: Message, correlation_id: Optional[str] = None) -> None:
-        response = None
+        logger.debug("Received message: %s", message)
         command = message["payload"]["commandType"]
         parameters = message["payload"]["parameters"]
 
-        if command == "set":
-            telemetry_type = "azel"
-            response = self.mount.set(parameters.get("azimuth"), parameters.get("elevation"))
-
-        elif command == "status":
-            telemetry_type = "azel"
-            response = self.mount.status()
-
-        elif command == "stop":
-            telemetry_type = None
-            response = self.mount.stop()
+        if command == "batch":
+            # Run the sub-commands in order and answer them all in one telemetry message
+            telemetry_type = "batch"
+            results = [
+                (await self.execute(sub_command["command"], sub_command.get("parameters", {})))[1]
+                for sub_command in parameters["commands"]
+            ]
+            telemetry_parameters = {"results": results}
+        else:
+            telemetry_type, telemetry_parameters = await self.execute(command, parameters)
+
+        if telemetry_type == "azel":
+            # An idle rotator reports the same position on every poll; RPC callers still always get their reply
+            azel = (telemetry_parameters["azimuth"], telemetry_parameters["elevation"])
+            if correlation_id is None and azel == self._last_azel and self._azel_suppressed < self.azel_repeat_interval:
+                self._azel_suppressed += 1
+                return
+            self._last_azel, self._azel_suppressed = azel, 0
 
         if telemetry_type is not None:
             routing_key = f"{self.routing_key_base}.{telemetry_type}"
-            az, el = response
-            telemetry_msg = self.node_operations.msg_generator.generate_telemetry(
-                "azel", {"azimuth": az, "elevation": el}
-            )
+            telemetry_msg = self.node_operations.msg_generator.generate_telemetry(telemetry_type, telemetry_parameters)
             await self.node_operations.publish_message(routing_key, telemetry_msg, correlation_id)
 
 
@@ -50,7 +90,7 @@ class MountController(AsyncMessageNodeOperator):
         if config is None:
             config = MountControllerConfig()
         mount_driver = ROT2Prog(config.DEVICE_ADDRESS)
-        handlers = [MountCommandHandler(mount_driver)]
+        handlers = [MountCommandHandler(mount_driver, config.AZEL_REPEAT_INTERVAL)]
         super().__init__(config, handlers, shutdown_event)
 
 
@@ -75,7 +115,7 @@ async def main():
         await shutdown_event.wait()  # Wait for the shutdown signal
 
     except Exception as e:
-        print(f"An unexpected error occurred: {e}")
+        logger.error(f"An unexpected error occurred: {e}")
 
     finally:
         await controller.stop()
@@ -3,103 +3,241 @@ import argparse
 import logging
 import time
 import random
+from typing import Optional
 
 
 logger = logging.getLogger(__name__)
 
+# One-byte write buffers for every relay state, shared instead of allocated per write
+_BYTE_TABLE = tuple(bytes((i,)) for i in range(256))
+
+
+
+class _SharedDevice:
+    """An open FTDI device together with its relay state and the number of relay instances using it"""
+
+    __slots__ = ("dev", "state", "refs")
+
+    def __init__(self, dev: pylibftdi.Device):
+        self.dev = dev
+        self.state = 0x00
+        self.refs = 0
+
+
+# Open devices by device id, so a new relay instance reuses the configured handle instead of re-enumerating USB.
+# The cache is per process: relay instances in one process share a device, separate processes each open their own.
+_DEVICE_CACHE: dict[Optional[str], _SharedDevice] = {}
+
 
 class FTDIBitbangRelay:
+    """
+    Relay board driven through an FTDI chip in bitbang mode. The chip's latency timer is lowered from the 16 ms default
+    to 1 ms, since every relay operation is a single-byte write/read round trip that would otherwise wait out the timer.
+    """
+
     BITMODE_BITBANG = 0x01  # Define bitbang mode value
     BITMODE_RESET = 0x00  # Define reset mode value
+    LATENCY_TIMER_MS = 1  # USB IN latency timer (ms); FTDI default is 16
+    READBACK_ATTEMPTS = 5  # Pin readbacks tried after a write before giving up on confirming it
 
     def __init__(self, device_id=None):
+        self.device_id = device_id
+        self.closed = False
+        self.shared = _DEVICE_CACHE.get(device_id)
+        if self.shared is None:
+            self.shared = _SharedDevice(self._open_device())
+            _DEVICE_CACHE[device_id] = self.shared
+            # Attempt to read the initial state of the device
+            self.local_state = self._read_device_state()
+        else:
+            # Instances sharing a device also share its state, so one instance's writes are seen by the others
+            logger.debug(f"Reusing open FTDI device {device_id}")
+        self.shared.refs += 1
+
+    @property
+    def dev(self) -> pylibftdi.Device:
+        return self.shared.dev
+
+    @property
+    def local_state(self) -> int:
+        return self.shared.state
+
+    @local_state.setter
+    def local_state(self, state: int):
+        self.shared.state = state
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _open_device(self) -> pylibftdi.Device:
         # Initialize the FTDI device
-        self.driver = pylibftdi.Driver()
         try:
-            if device_id:
-                self.dev = pylibftdi.Device(device_id=device_id)
+            if self.device_id:
+                dev = pylibftdi.Device(device_id=self.device_id)
             else:
-                self.dev = pylibftdi.Device()
-            self.dev.baudrate = 9600
-            self.dev.ftdi_fn.ftdi_set_bitmode(0xFF, self.BITMODE_BITBANG)  # Enable bitbang mode
+                dev = pylibftdi.Device()
+            dev.baudrate = 9600
+            dev.ftdi_fn.ftdi_set_bitmode(0xFF, self.BITMODE_BITBANG)  # Enable bitbang mode
             logger.info("Initialized FTDI device in bitbang mode.")
         except pylibftdi.FtdiError as e:
             logger.exception("Failed to initialize FTDI device")
             raise
 
-        # Attempt to read the initial state of the device
-        self.local_state = self._read_device_state()
+        self._set_latency_timer(dev, self.LATENCY_TIMER_MS)
+        return dev
 
-    def _read_device_state(self):
-        try:
-            # Flush any previous data
-            # mp I don't think this does anything
-            # self.dev.flush_input()
+    def _release_device(self):
+        if _DEVICE_CACHE.get(self.device_id) is self.shared:
+            del _DEVICE_CACHE[self.device_id]
 
-            # Read the current state from the device, this will be used as the local state
-            state = ord(self.dev.read(1)) if self.dev.read(1) else 0x00
+    def reset(self):
+        """
+        Close and reopen the device, re-entering bitbang mode, then reload the local state from its pins. Every
+        instance sharing the device picks up the new handle.
+        """
+        self._release_device()
+        try:
+            self.dev.close()
+        except pylibftdi.FtdiError:
+            logger.exception("Failed to close FTDI device before reset")
+        self.shared.dev = self._open_device()
+        _DEVICE_CACHE[self.device_id] = self.shared
+        self.local_state = self._read_device_state()
 
-            # Perform a dummy read to clear the buffer after the initial read
-            self.dev.read(1)
+    def _set_latency_timer(self, dev: pylibftdi.Device, latency_ms: int):
+        # Not fatal: the relays still work at the default latency, just with slower read round trips
+        try:
+            if dev.ftdi_fn.ftdi_set_latency_timer(latency_ms) < 0:
+                logger.warning(f"Failed to set FTDI latency timer to {latency_ms} ms")
+            else:
+                logger.debug(f"FTDI latency timer set to {latency_ms} ms")
+        except pylibftdi.FtdiError:
+            logger.exception("Failed to set FTDI latency timer")
 
-            return state
+    def _read_device_state(self):
+        try:
+            # Drop any stale bytes, then read the current pins once; this becomes the local state
+            self.dev.flush_input()
+            readback = self.dev.read(1)
+            return readback[0] if readback else 0x00
         except pylibftdi.FtdiError as e:
             logger.exception("Failed to read initial state from FTDI device")
             return 0x00  # Default to all relays off if read fails
 
+    def _write_state(self, state: int) -> bool:
+        """Write the relay byte and poll the pin readback until it reflects it, returning whether it did"""
+        self.dev.write(_BYTE_TABLE[state])
+        for attempt in range(self.READBACK_ATTEMPTS):
+            # Drop the echo of the write (and anything older) so the read returns the current pins
+            self.dev.flush_input()
+            readback = self.dev.read(1)
+            if readback and readback[0] == state:
+                return True
+            time.sleep(0.001)
+        logger.warning(f"Relay state {state:08b} not confirmed by readback after {self.READBACK_ATTEMPTS} attempts")
+        return False
+
+    def _apply_state(self, state: int) -> bool:
+        """Write the relay byte as the new local state, resyncing it from the pins if the write is not confirmed"""
+        self.local_state = state
+        if self._write_state(state):
+            return True
+        # The write may not have taken; adopt what the pins report rather than keep claiming the requested state
+        self.local_state = self._read_device_state()
+        logger.error(f"Relay write of {state:08b} failed; local state resynced from device to {self.local_state:08b}")
+        return False
+
     def get_relay_state(self):
         """
-        Returns the current state of the relays.
+        Returns the current state of the relays. The local state is authoritative (every write is confirmed by
+        readback, and an unconfirmed write resyncs it from the pins), so this never touches the device.
         """
         return self.local_state
 
-    def set_relay(self, relay_num: int, state: str):
+    def set_relay(self, relay_num: int, state: str) -> bool:
+        """Switch one relay, returning whether the write was confirmed by readback"""
         try:
             # Calculate bitmask for the specific relay
             pin_mask = 1 << (relay_num - 1)
 
-            # Update the local state based on the desired relay state
+            # Compute the new state based on the desired relay state
             if state == "on":
-                self.local_state |= pin_mask
+                new_state = self.local_state | pin_mask
             else:
-                self.local_state &= ~pin_mask
-
-            # Write the new state to the FTDI device
-            self.dev.write(bytes([self.local_state]))
-
-            # Wait briefly to ensure the FTDI device processes the write
-            time.sleep(0.05)
+                new_state = self.local_state & ~pin_mask
 
-            # Perform a dummy read to ensure the next read is accurate
-            self.dev.read(1)
+            # Write the new state to the FTDI device and wait only as long as the readback takes to confirm it
+            confirmed = self._apply_state(new_state)
 
-            logger.debug(f"Relay {relay_num} set to {state.upper()}. Local state: {self.local_state:08b}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Relay {relay_num} set to {state.upper()}. Local state: {self.local_state:08b}")
+            return confirmed
 
         except pylibftdi.FtdiError as e:
             logger.exception(f"Failed to set relay {relay_num}")
 
         except Exception as e:
             logger.exception("An unexpected error occurred while setting the relay")
+        return False
+
+    def set_relays(self, changes: dict[int, str]) -> bool:
+        """
+        Apply several relay changes ({relay_num: "on" | "off"}) with a single write and readback, returning whether
+        the write was confirmed
+        """
+        try:
+            state = self.local_state
+            for relay_num, relay_state in changes.items():
+                pin_mask = 1 << (relay_num - 1)
+                if relay_state == "on":
+                    state |= pin_mask
+                else:
+                    state &= ~pin_mask
+
+            confirmed = self._apply_state(state)
+
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Relays {changes} set. Local state: {self.local_state:08b}")
+            return confirmed
+
+        except pylibftdi.FtdiError as e:
+            logger.exception(f"Failed to set relays {changes}")
+
+        except Exception as e:
+            logger.exception("An unexpected error occurred while setting the relays")
+        return False
 
     def test_readback(self):
         try:
             # Write a known pattern
             # test_pattern = 0xAA  # 10101010 in binary
             test_pattern = random.randint(0, 255)  # Random number between 0 and 255
-            self.dev.write(bytes([test_pattern]))
+            self.dev.write(_BYTE_TABLE[test_pattern])
 
             # Perform a dummy read to retrieve the echo of the write operation.
             # This is just to maintain proper synchronization based on your observations.
             dummy_read = self.dev.read(1)
 
-            # Short delay to allow the device to process the change
-            time.sleep(0.1)  # 100 ms delay, adjust as necessary
+            # Short delay to allow the device to process the change (the 1 ms latency timer makes this ample)
+            time.sleep(0.002)
 
             # Flush the device's input buffer to clear any stale data
             self.dev.flush_input()
 
-            # Read back the state
-            readback_pattern = ord(self.dev.read(1))
+            # Read back the state, retrying briefly if no byte has arrived yet
+            readback = b""
+            for attempt in range(self.READBACK_ATTEMPTS):
+                readback = self.dev.read(1)
+                if readback:
+                    break
+                time.sleep(0.001)
+            if not readback:
+                logger.error("Readback failed, no byte received from the device.")
+                return
+            readback_pattern = readback[0]
             logger.info(f"Written pattern: {test_pattern:08b}")
             logger.info(f"Read back pattern: {readback_pattern:08b}")
 
@@ -114,9 +252,19 @@ class FTDIBitbangRelay:
             logger.exception("An error occurred during the readback test")
 
     def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self.shared.refs -= 1
+        if self.shared.refs > 0:
+            # Another instance still drives the relays; only the last one to close releases the device
+            logger.debug(f"FTDI device still in use by {self.shared.refs} other relay instance(s), leaving it open")
+            return
+
+        self._release_device()
         try:
             # Turn off all relays before closure; this sets the next instance's current state as 00000000.
-            self.dev.write(bytes([0]))
+            self.dev.write(_BYTE_TABLE[0])
             self.dev.ftdi_fn.ftdi_set_bitmode(0x00, self.BITMODE_RESET)  # Disable bitbang mode, back to reset mode
             self.dev.close()
             logger.info("Closed FTDI device")
@@ -129,8 +277,12 @@ def main():
     parser.add_argument("relay_num", type=int, choices=range(1, 5), help="Relay number (1-4)")
     parser.add_argument("state", choices=["on", "off"], help='Relay state to set ("on" or "off")')
     parser.add_argument("-s", "--status", action="store_true", help="Get the status of the relay")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log device traffic at DEBUG level")
     args = parser.parse_args()
 
+    # Logging levels are an entrypoint decision; the driver itself only ever uses its module logger
+    logger.setLevel(logging.DEBUG if args.verbose else logging.INFO)
+
     relay = FTDIBitbangRelay()
     if args.status:
         print(f"Current Relay State: {relay.get_relay_state():08b}")
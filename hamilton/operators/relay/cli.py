@@ -5,9 +5,6 @@ from hamilton.operators.relay.client import RelayClient
 import asyncio
 import logging
 
-root_logger = logging.getLogger()
-root_logger.setLevel(logging.WARNING)
-
 
 async def handle_command(args):
     client = RelayClient()
@@ -28,7 +25,7 @@ async def handle_command(args):
         await client.stop()
 
 
-if __name__ == "__main__":
+def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Control and query the state of FTDI relays.")
     subparsers = parser.add_subparsers(dest="command", help="Sub-command help")
 
@@ -40,6 +37,14 @@ if __name__ == "__main__":
     # Sub-command 'status'
     parser_status = subparsers.add_parser("status", help="Get relay status")
 
+    return parser
+
+
+if __name__ == "__main__":
+    # Keep CLI output to the response itself; configured here so importing this module leaves logging untouched
+    logging.getLogger().setLevel(logging.WARNING)
+
+    parser = _build_parser()
     args = parser.parse_args()
 
     if args.command:
@@ -9,6 +9,8 @@ from hamilton.operators.relay.config import RelayClientConfig
 
 
 class RelayTelemetryHandler(MessageHandler):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(MessageHandlerType.TELEMETRY)
 
@@ -33,11 +35,19 @@ class RelayClient(AsyncMessageNodeOperator):
             response = await self.publish_message(routing_key, message)
         return response
 
-    async def set(self, id: Literal["uhf_bias", "vhf_bias", "vhf_pol", "uhf_pol"], state: Literal["on", "off"]) -> dict:
-        """Set relay state"""
+    async def set(
+        self, id: Literal["uhf_bias", "vhf_bias", "vhf_pol", "uhf_pol"], state: Literal["on", "off"], wait: bool = True
+    ) -> Optional[dict]:
+        """Set relay state, returning the resulting relay status (or None without waiting for it if `wait` is False)"""
         command = "set"
         parameters = {"id": id, "state": state}
-        return await self._publish_command(command, parameters, rpc=False)
+        return await self._publish_command(command, parameters, rpc=wait)
+
+    async def set_batch(self, relays: list[dict]) -> dict:
+        """Set several relay states in one device write, e.g. [{"id": "uhf_bias", "state": "on"}], returning status"""
+        command = "set_batch"
+        parameters = {"relays": relays}
+        return await self._publish_command(command, parameters)
 
     async def status(self) -> dict:
         """Query relay status"""
@@ -68,20 +78,15 @@ async def main():
         response = await client.status()
         print(response)
 
+        # Sets reply with the resulting status
         parameters = {"id": "uhf_bias", "state": "on"}
         response = await client.set(**parameters)
         print(response)
 
-        response = await client.status()
-        print(response)
-
         parameters = {"id": "uhf_bias", "state": "off"}
         response = await client.set(**parameters)
         print(response)
 
-        response = await client.status()
-        print(response)
-
     except Exception as e:
         print(f"An unexpected error occurred: {e}")
 
@@ -14,6 +14,7 @@ class RelayControllerConfig(MessageNodeConfig):
     ]
 
     DEVICE_ID = "AB0OQ0PW"
+    STATUS_REPEAT_INTERVAL = 10  # Unchanged uncorrelated status telemetry is republished only after 10 suppressed repeats
 
 
 class RelayClientConfig(MessageNodeConfig):
@@ -30,6 +31,7 @@ class RelayClientConfig(MessageNodeConfig):
             rpc=True,
             routing_keys=[
                 "observatory.relay.command.set",
+                "observatory.relay.command.set_batch",
                 "observatory.relay.command.status",
             ],
         ),
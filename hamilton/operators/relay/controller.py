@@ -1,5 +1,7 @@
 import asyncio
 import signal
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from typing import Optional
 import logging
 
@@ -11,48 +13,109 @@ from hamilton.operators.relay.api import FTDIBitbangRelay
 
 logger = logging.getLogger(__name__)
 
+# Relay name -> its bit in the device state byte (relay n is bit n - 1)
+_RELAY_BITS = (("uhf_bias", 0x01), ("vhf_bias", 0x02), ("vhf_pol", 0x04), ("uhf_pol", 0x08))
+_ON_OFF = ("off", "on")
+
 
 class RelayCommandHandler(MessageHandler):
-    def __init__(self, relay_driver: FTDIBitbangRelay):
+    __slots__ = (
+        "relay",
+        "executor",
+        "status_repeat_interval",
+        "_last_status",
+        "_status_suppressed",
+        "id_map",
+        "routing_key_base",
+    )
+
+    def __init__(self, relay_driver: FTDIBitbangRelay, status_repeat_interval: int = 10):
         super().__init__(message_type=MessageHandlerType.COMMAND)
         self.shutdown_hooks = [self.shutdown_relay]
         self.relay = relay_driver
+        # FTDI I/O blocks on USB round trips; a single worker keeps it off the event loop and the device ops in order
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ftdi-relay")
+        # Last published status and how many identical ones have been suppressed since, doubling as a heartbeat count
+        self.status_repeat_interval = status_repeat_interval
+        self._last_status: Optional[dict] = None
+        self._status_suppressed = 0
         self.id_map = {"uhf_bias": 1, "vhf_bias": 2, "vhf_pol": 3, "uhf_pol": 4}
         self.routing_key_base = "observatory.relay.telemetry"
 
     async def shutdown_relay(self):
-        self.relay.close()
+        try:
+            await self.run_device(self.relay.close)
+        finally:
+            self.executor.shutdown(wait=False)
+
+    async def run_device(self, func, *args, **kwargs):
+        """Run a blocking FTDIBitbangRelay call on the device worker thread"""
+        return await asyncio.get_running_loop().run_in_executor(self.executor, partial(func, *args, **kwargs))
 
     def parse_state_to_dict(self, state):
-        relay_names = ["uhf_bias", "vhf_bias", "vhf_pol", "uhf_pol"]
-        state_dict = {}
-        for i, name in enumerate(relay_names):
-            # Shift the state right by i places and check the least significant bit
-            state_dict[name] = "on" if state & (1 << i) else "off"
-        return state_dict
+        return {name: _ON_OFF[bool(state & bit)] for name, bit in _RELAY_BITS}
+
+    def validate(self, id: str, state: str) -> Optional[str]:
+        """Return why a relay setting is invalid, or None if it is valid"""
+        if state not in ["on", "off"]:
+            error = f"{state} not in [on, off]"
+        elif id not in self.id_map:
+            error = f"{id} not in {list(self.id_map.keys())}"
+        else:
+            return None
+        logger.warning(error)
+        return error
 
     async def handle_message(self, message: Message, correlation_id: Optional[str] = None) -> None:
         response = None
+        error = None
         command = message["payload"]["commandType"]
         parameters = message["payload"]["parameters"]
 
+        # Sets answer with the resulting status, so callers need no follow-up status request. A rejected set still
+        # answers, with the unchanged status and an "error" field, so RPC callers never wait out their timeout. A set
+        # the device does not confirm answers the same way, with the status read back from the pins.
         if command == "set":
-            telemetry_type = None
+            telemetry_type = "status"
             id = parameters.get("id")
             state = parameters.get("state")
-            if state not in ["on", "off"]:
-                logger.warning(f"{state} not in [on, off]")
-                return response
-            if id not in self.id_map:
-                logger.warning(f"{id} not in {list(self.id_map.keys())}")
-                return response
-            else:
-                response = self.relay.set_relay(relay_num=self.id_map[id], state=state)
+            error = self.validate(id, state)
+            if error is None:
+                if not await self.run_device(self.relay.set_relay, relay_num=self.id_map[id], state=state):
+                    error = f"Setting {id} {state} was not confirmed by the device"
+
+        elif command == "set_batch":
+            # Several relays in one device write; the batch is rejected whole if any entry is invalid
+            telemetry_type = "status"
+            relays = parameters.get("relays", [])
+            errors = [self.validate(relay.get("id"), relay.get("state")) for relay in relays]
+            error = "; ".join(e for e in errors if e is not None) or None
+            if error is None:
+                changes = {self.id_map[relay["id"]]: relay["state"] for relay in relays}
+                if not await self.run_device(self.relay.set_relays, changes):
+                    error = f"Setting {parameters['relays']} was not confirmed by the device"
 
         elif command == "status":
             telemetry_type = "status"
-            raw_response = self.relay.get_relay_state()
+
+        else:
+            telemetry_type = None
+
+        if telemetry_type == "status":
+            raw_response = await self.run_device(self.relay.get_relay_state)
             response = self.parse_state_to_dict(raw_response)
+            # Relay states rarely change between polls; RPC callers and rejected sets still always get their reply
+            if error is not None:
+                response["error"] = error
+            elif (
+                correlation_id is None
+                and response == self._last_status
+                and self._status_suppressed < self.status_repeat_interval
+            ):
+                self._status_suppressed += 1
+                return response
+            else:
+                self._last_status, self._status_suppressed = response, 0
 
         if telemetry_type is not None:
             routing_key = f"{self.routing_key_base}.{telemetry_type}"
@@ -66,7 +129,7 @@ class RelayController(AsyncMessageNodeOperator):
         if config is None:
             config = RelayControllerConfig()
         relay_driver = FTDIBitbangRelay(device_id=config.DEVICE_ID)
-        handlers = [RelayCommandHandler(relay_driver)]
+        handlers = [RelayCommandHandler(relay_driver, config.STATUS_REPEAT_INTERVAL)]
         super().__init__(config, handlers, shutdown_event)
 
 
@@ -81,7 +81,8 @@ class SDRSigMFRecord:
             parameters = {"id": "vhf_bias", "state": state}
         else:
             parameters = {"id": "uhf_bias", "state": state}
-        response = await self.relay.set(**parameters)
+        # Fire and forget, so recording start/stop never stalls on an RPC timeout if the relay controller is down
+        response = await self.relay.set(**parameters, wait=False)
         logger.info(f"Relay id {parameters['id']} set to state {parameters['state']}")
         return response
 
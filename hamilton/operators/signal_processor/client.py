@@ -33,16 +33,19 @@ class SignalProcessorClient(AsyncMessageNodeOperator):
             response = await self.publish_message(routing_key, message)
         return response
 
-    async def generate_psds(self, parameters: dict = {}):
+    async def generate_psds(self, parameters: Optional[dict] = None):
         command = "generate_psds"
+        parameters = parameters if parameters is not None else {}
         return await self._publish_command(command, parameters, rpc=True, timeout=120)
 
-    async def generate_spectrograms(self, parameters: dict = {}):
+    async def generate_spectrograms(self, parameters: Optional[dict] = None):
         command = "generate_spectrograms"
+        parameters = parameters if parameters is not None else {}
         return await self._publish_command(command, parameters, rpc=True, timeout=240)
 
-    async def generate_panels(self, parameters: dict = {}):
+    async def generate_panels(self, parameters: Optional[dict] = None):
         command = "generate_panels"
+        parameters = parameters if parameters is not None else {}
         return await self._publish_command(command, parameters, rpc=True, timeout=240)
 
 shutdown_event = asyncio.Event()
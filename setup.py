@@ -19,7 +19,10 @@ setuptools.setup(
         "bson",
         "pyserial",
         "motor",
-        "pylibftdi"
+        "pymongo[zstd]",
+        "pylibftdi",
+        "orjson>=3.9",
+        "pyarrow",
     ]
 )
 